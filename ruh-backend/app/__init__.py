@@ -32,4 +32,8 @@ def create_app():
     from .utils.error_handlers import register_error_handlers
     register_error_handlers(app)
     
+    # Scan the surah index off the request path; verse results read chapter lengths from it
+    from .services.verse_service import get_verse_service
+    get_verse_service().warm_surah_index()
+    
     return app
\ No newline at end of file
@@ -1,8 +1,14 @@
 import os
 import logging
-from groq import Groq
+import httpx
+from groq import Groq, DefaultHttpxClient
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+# Keep-alive pool shared by all Groq calls, so requests reuse TLS connections
+GROQ_HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+# Fail fast on connect; a full wellness analysis stays well under the read timeout
+GROQ_HTTP_TIMEOUT = httpx.Timeout(30.0, connect=2.0)
+
 class GroqClient:
     _instance = None
     _client = None
@@ -20,14 +26,18 @@ class GroqClient:
             raise ValueError("GROQ_API_KEY environment variable is required")
         
         try:
-            self._client = Groq(api_key=api_key)
+            self._client = Groq(
+                api_key=api_key,
+                timeout=GROQ_HTTP_TIMEOUT,
+                http_client=DefaultHttpxClient(limits=GROQ_HTTP_LIMITS, timeout=GROQ_HTTP_TIMEOUT)
+            )
             logging.info("Groq client initialized successfully")
         except Exception as e:
             logging.error(f"Failed to initialize Groq client: {e}")
             raise
     
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    def generate_response(self, prompt: str = None, system_prompt: str = None, max_tokens: int = 500, temperature: float = 0.7, model: str = "llama-3.1-8b-instant") -> str:
+    def generate_response(self, prompt: str = None, system_prompt: str = None, max_tokens: int = 500, temperature: float = 0.7, model: str = "llama-3.1-8b-instant", response_format: dict = None) -> str:
         """
         Generate a response using Groq API with retry logic
         
@@ -38,6 +48,7 @@ class GroqClient:
             max_tokens: Maximum tokens to generate
             temperature: Creativity temperature (0.0 to 1.0)
             model: The model to use for generation
+            response_format: Optional output format, e.g. {"type": "json_object"} for JSON mode
         
         Returns:
             Generated text response
@@ -51,6 +62,8 @@ class GroqClient:
                 messages.append({"role": "system", "content": system_prompt})
             
             messages.append({"role": "user", "content": prompt})
+            
+            options = {"response_format": response_format} if response_format else {}
            
             chat_completion = self._client.chat.completions.create(
                 messages=messages,
@@ -58,6 +71,7 @@ class GroqClient:
                 max_tokens=max_tokens,
                 temperature=temperature,
                 top_p=0.9,
+                **options
             )
             return chat_completion.choices[0].message.content
         except Exception as e:
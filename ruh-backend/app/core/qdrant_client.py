@@ -1,8 +1,7 @@
 import os
-from typing import Tuple, List, Dict, Any, Optional
+from typing import Tuple, List, Any, Optional
 from qdrant_client import QdrantClient
 from qdrant_client.http.models import PointStruct
-from qdrant_client.models import ScrollResult
 
 class QdrantClientWrapper:
     """
@@ -49,16 +48,22 @@ class QdrantClientWrapper:
         print("No collections found in Qdrant")
         return None
     
-    def scroll_points(self, collection_name: str, batch_size: int = 100, scroll_filter=None, scroll_cursor=None) -> Tuple[List[PointStruct], Any]:
+    def scroll_points(self, collection_name: str, batch_size: int = 100, scroll_filter=None, scroll_cursor=None,
+                      with_payload=True, with_vectors: bool = False) -> Tuple[List[PointStruct], Any]:
         """
         Scroll through points in a collection.
+        
+        Pass a list of field names as with_payload to fetch only those payload keys.
+        Vectors are not returned unless explicitly requested.
         """
         try:
             points, new_scroll_cursor = self.client.scroll(
                 collection_name=collection_name,
                 scroll_filter=scroll_filter,
                 limit=batch_size,
-                offset=scroll_cursor
+                offset=scroll_cursor,
+                with_payload=with_payload,
+                with_vectors=with_vectors
             )
             
             print(f"Retrieved {len(points)} points from Qdrant")
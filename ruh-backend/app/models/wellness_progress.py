@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from datetime import datetime
 from app.models.database import Base
 
@@ -16,3 +16,8 @@ class WellnessProgress(Base):
     notes = Column(Text, nullable=True)
     analysis = Column(Text, nullable=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
+
+    # Serves the per-user history query (filter by user_id, newest first)
+    __table_args__ = (
+        Index('ix_wellness_user_ts', 'user_id', timestamp.desc()),
+    )
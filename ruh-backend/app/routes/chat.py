@@ -4,6 +4,9 @@ from app.utils.helpers import validate_chat_request
 
 chat_bp = Blueprint('chat', __name__)
 
+# Fields a verse choice request must provide
+VERSE_CHOICE_REQUIRED_FIELDS = ('choice', 'conversation_id', 'message_id', 'original_message')
+
 @chat_bp.route('/chat', methods=['POST'])
 def chat():
     """
@@ -51,8 +54,7 @@ def handle_verse_choice():
     print(f"DEBUG: Choice: {data.get('choice')}")
     
     # Validate required fields
-    required_fields = ['choice', 'conversation_id', 'message_id', 'original_message']
-    for field in required_fields:
+    for field in VERSE_CHOICE_REQUIRED_FIELDS:
         if field not in data:
             return jsonify({"error": f"{field} is required"}), 400
     
@@ -1,8 +1,12 @@
-from flask import Blueprint, request, jsonify
-from app.services.verse_service import VerseService
+from flask import Blueprint, request, jsonify, current_app
+from app.services.verse_service import get_verse_service
 
 verses_bp = Blueprint('verses', __name__)
-verse_service = VerseService()
+verse_service = get_verse_service()
+
+# Serialized GET /chapters body; the chapter list never changes once loaded,
+# so it is encoded once instead of on every request
+_chapters_body = None
 
 @verses_bp.route('/', methods=['GET'])
 def index():
@@ -28,13 +32,20 @@ def get_chapters():
     """
     Get a list of all Quranic chapters/surahs with first entry for each surah
     """
+    global _chapters_body
     try:
-        entries = verse_service.get_first_entries_per_surah()
+        body = _chapters_body
+        if body is None:
+            entries = verse_service.get_first_entries_per_surah()
+            body = current_app.json.dumps({
+                "chapters": entries,
+                "total_chapters": len(entries)
+            }) + "\n"
+            # Keep an empty list uncached so a failed index load is retried
+            if entries:
+                _chapters_body = body
         
-        return jsonify({
-            "chapters": entries,
-            "total_chapters": len(entries)
-        }), 200
+        return current_app.response_class(body, mimetype="application/json"), 200
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
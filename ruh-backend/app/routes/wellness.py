@@ -1,149 +1,189 @@
-from flask import Blueprint, request, jsonify
-from app.services.wellness_service import WellnessService
-from app.models.database import get_db
+from functools import wraps
+from flask import Blueprint, request, jsonify, g
+from werkzeug.exceptions import HTTPException
+from app.services.wellness_service import wellness_service, bind_db_session, reset_db_session, WellnessError
+from app.models.database import SessionLocal
 
 wellness_bp = Blueprint('wellness', __name__)
 
+# Fields every check-in must provide
+CHECKIN_REQUIRED_FIELDS = ('mood', 'energy_level', 'stress_level')
+# Largest number of check-ins accepted by one bulk request
+MAX_BULK_CHECKINS = 500
+# Largest history page returned by GET /wellness, so one request stays bounded
+MAX_HISTORY_LIMIT = 100
+
+def _err(message, status_code=500):
+    """Build the JSON error response shared by every wellness route"""
+    return jsonify({"error": message}), status_code
+
+def _handle_errors(view):
+    """
+    Return unexpected errors as a 500 JSON response. WellnessError and HTTP errors
+    (e.g. 400 for malformed JSON) are left to Flask and the app's handlers.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            return view(*args, **kwargs)
+        except (WellnessError, HTTPException):
+            raise
+        except Exception as e:
+            return _err(str(e))
+    return wrapper
+
+@wellness_bp.before_request
+def open_db_session():
+    """Open a session for this request and bind it to the wellness service"""
+    g.wellness_db = SessionLocal()
+    g.wellness_db_token = bind_db_session(g.wellness_db)
+
+@wellness_bp.teardown_request
+def close_db_session(exc):
+    token = g.pop('wellness_db_token', None)
+    if token is not None:
+        reset_db_session(token)
+    db = g.pop('wellness_db', None)
+    if db is not None:
+        db.close()
+
 @wellness_bp.route('/wellness', methods=['GET'])
+@_handle_errors
 def get_wellness_history():
     """
     Get wellness history and stats for a user
     Consolidated endpoint that handles both history and stats
     """
+    user_id = request.args.get('user_id', 'default_user')
     try:
-        db = next(get_db())
-        wellness_service = WellnessService(db=db)
-        
-        user_id = request.args.get('user_id', 'default_user')
-        limit = int(request.args.get('limit', 10))
-        offset = int(request.args.get('offset', 0))
-        
-        history = wellness_service.get_wellness_history(user_id, limit=limit, offset=offset)
-        
-        response = {
-            "wellness_history": history.get("wellness_history", []),
-            "user_id": user_id,
-            "total_entries": history.get("total_entries", 0)
-        }
-        
-        return jsonify(response), 200
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        limit = min(max(int(request.args.get('limit', 10)), 1), MAX_HISTORY_LIMIT)
+        offset = max(int(request.args.get('offset', 0)), 0)
+    except ValueError:
+        return _err("limit and offset must be integers", 400)
+    
+    history = wellness_service.get_wellness_history(user_id, limit=limit, offset=offset)
+    
+    response = {
+        "wellness_history": history.get("wellness_history", []),
+        "user_id": user_id,
+        "total_entries": history.get("total_entries", 0)
+    }
+    
+    return jsonify(response), 200
 
 @wellness_bp.route('/wellness/checkin', methods=['POST'])
+@_handle_errors
 def wellness_checkin():
     """
     Submit a wellness check-in and get personalized guidance
     """
-    try:
-        db = next(get_db())
-        wellness_service = WellnessService(db=db)
-        
-        data = request.get_json()
-        
-        # Validate required fields
-        required_fields = ['mood', 'energy_level', 'stress_level']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
-        
-        result = wellness_service.process_wellness_checkin(
-            mood=data['mood'],
-            energy_level=data['energy_level'],
-            stress_level=data['stress_level'],
-            notes=data.get('notes', ''),
-            user_id=data.get('user_id')
-        )
-        
-        return jsonify(result), 200
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    data = request.get_json()
+    
+    # Validate required fields
+    for field in CHECKIN_REQUIRED_FIELDS:
+        if field not in data:
+            return _err(f"Missing required field: {field}", 400)
+    
+    result = wellness_service.process_wellness_checkin(
+        mood=data['mood'],
+        energy_level=data['energy_level'],
+        stress_level=data['stress_level'],
+        notes=data.get('notes', ''),
+        user_id=data.get('user_id')
+    )
+    
+    return jsonify(result), 200
+
+@wellness_bp.route('/wellness/checkin/bulk', methods=['POST'])
+@_handle_errors
+def wellness_checkin_bulk():
+    """
+    Submit several wellness check-ins at once (e.g. syncing offline check-ins)
+    """
+    data = request.get_json()
+    if not isinstance(data, dict):
+        return _err("Request body must be a JSON object", 400)
+    
+    checkins = data.get('checkins')
+    if not isinstance(checkins, list) or not checkins:
+        return _err("checkins must be a non-empty list", 400)
+    if len(checkins) > MAX_BULK_CHECKINS:
+        return _err(f"Too many check-ins (max {MAX_BULK_CHECKINS})", 400)
+    
+    # Validate required fields
+    for index, checkin in enumerate(checkins):
+        if not isinstance(checkin, dict):
+            return _err(f"Check-in {index} must be an object", 400)
+        for field in CHECKIN_REQUIRED_FIELDS:
+            if field not in checkin:
+                return _err(f"Check-in {index} is missing required field: {field}", 400)
+    
+    result = wellness_service.process_wellness_checkins_bulk(
+        checkins,
+        user_id=data.get('user_id', 'default_user')
+    )
+    
+    return jsonify(result), 200
 
 @wellness_bp.route('/wellness/ai-analysis', methods=['POST'])
+@_handle_errors
 def get_ai_wellness_analysis():
     """
     Get AI-powered wellness analysis with Islamic themes and verse recommendations.
     """
-    try:
-        db = next(get_db())
-        wellness_service = WellnessService(db=db)
-        
-        data = request.get_json()
-        
-        if not data or 'user_id' not in data:
-            return jsonify({"error": "Missing required field: user_id"}), 400
-            
-        user_id = data['user_id']
-        
-        # Get user's wellness history
-        history = wellness_service.get_wellness_history(user_id)
-        progress_data = history.get("wellness_history", [])
-        
-        # Check if there's any data - use a more lenient check
-        if len(progress_data) == 0:
-            return jsonify({
-                "message": "Not enough wellness data for analysis.",
-                "user_id": user_id,
-                "analysis": None
-            }), 200
-            
-        # Generate AI analysis
-        analysis = wellness_service.analyze_with_groq(progress_data)
-        
+    data = request.get_json()
+    
+    if not data or 'user_id' not in data:
+        return _err("Missing required field: user_id", 400)
+        
+    user_id = data['user_id']
+    
+    # Get user's wellness history
+    history = wellness_service.get_wellness_history(user_id)
+    progress_data = history.get("wellness_history", [])
+    
+    # Check if there's any data - use a more lenient check
+    if len(progress_data) == 0:
         return jsonify({
-            "success": True,
+            "message": "Not enough wellness data for analysis.",
             "user_id": user_id,
-            "analysis": analysis
+            "analysis": None
         }), 200
         
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    # Generate AI analysis
+    analysis = wellness_service.analyze_with_groq(progress_data, user_id=user_id)
+    
+    return jsonify({
+        "success": True,
+        "user_id": user_id,
+        "analysis": analysis
+    }), 200
 
 @wellness_bp.route('/wellness/clear', methods=['DELETE'])
+@_handle_errors
 def clear_wellness_data():
     """
     Clear all wellness data for a user
     """
-    try:
-        db = next(get_db())
-        wellness_service = WellnessService(db=db)
-        
-        user_id = request.args.get('user_id')
-        if not user_id:
-            return jsonify({"error": "user_id parameter is required"}), 400
-        
-        result = wellness_service.clear_wellness_data(user_id)
-        
-        if result["success"]:
-            return jsonify(result), 200
-        else:
-            return jsonify(result), 500
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    user_id = request.args.get('user_id')
+    if not user_id:
+        return _err("user_id parameter is required", 400)
+    
+    result = wellness_service.clear_wellness_data(user_id)
+    
+    return jsonify(result), 200
 
 @wellness_bp.route('/wellness/clear-all', methods=['DELETE'])
+@_handle_errors
 def clear_all_wellness_data():
     """
     Clear all wellness data for all users (admin function)
     """
-    try:
-        db = next(get_db())
-        wellness_service = WellnessService(db=db)
-        
-        # Optional: Add admin authentication check here
-        # admin_key = request.headers.get('X-Admin-Key')
-        # if admin_key != 'your_admin_key':
-        #     return jsonify({"error": "Unauthorized"}), 401
-        
-        result = wellness_service.clear_all_wellness_data()
-        
-        if result["success"]:
-            return jsonify(result), 200
-        else:
-            return jsonify(result), 500
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    # Optional: Add admin authentication check here
+    # admin_key = request.headers.get('X-Admin-Key')
+    # if admin_key != 'your_admin_key':
+    #     return jsonify({"error": "Unauthorized"}), 401
+    
+    result = wellness_service.clear_all_wellness_data()
+    
+    return jsonify(result), 200
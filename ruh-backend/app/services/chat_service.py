@@ -1,23 +1,80 @@
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 from app.core.groq_client import groq_client
 from app.core import PROMPT_TEMPLATES
 from app.services.conversation_service import ConversationService
-from app.services.verse_service import VerseService
+from app.services.verse_service import get_verse_service
+from app.utils.cache import LRUCache
+
+# Words in recent user messages that tag the conversation's emotional tone
+EMOTIONAL_SUPPORT_WORDS = frozenset({'sad', 'down', 'depressed', 'upset'})
+POSITIVE_WORDS = frozenset({'blessed', 'good', 'happy', 'well'})
+MESSAGE_WORD_PATTERN = re.compile(r'\w+')
+
+# Short greetings and acknowledgements carry no sentiment or theme worth a Groq
+# call; messages of at most SMALL_TALK_MAX_WORDS words drawn only from this set
+# get the default analysis directly
+SMALL_TALK_WORDS = frozenset({
+    'hi', 'hello', 'hey', 'salam', 'salaam', 'assalamu', 'alaikum', 'alaykum',
+    'thanks', 'thank', 'you', 'ok', 'okay', 'bye', 'goodbye', 'yes', 'no',
+    'good', 'morning', 'evening', 'night', 'jazakallah', 'khair', 'khairan'
+})
+SMALL_TALK_MAX_WORDS = 3
+
+# Sentiment analyses are reused only for the same message text (case and
+# whitespace aside); embeddings barely separate negations like "I'm not sad
+# anymore" from "I'm so sad", so near matches are not safe to share
+SENTIMENT_CACHE_SIZE = 512
+
+# Threads that run the sentiment call while a request does its database work
+CHAT_WORKER_THREADS = 8
+
+@lru_cache(maxsize=4096)
+def _message_tone(content: str) -> Optional[str]:
+    """Tone theme of a user message ('emotional_support', 'positive' or None).
+
+    Cached because each turn re-reads the same recent messages.
+    """
+    words = set(MESSAGE_WORD_PATTERN.findall(content.lower()))
+    if not words.isdisjoint(EMOTIONAL_SUPPORT_WORDS):
+        return 'emotional_support'
+    if not words.isdisjoint(POSITIVE_WORDS):
+        return 'positive'
+    return None
+
+def _unique_verses(verses, limit: int) -> list:
+    """First limit verses in order, skipping repeats and verses without a verse number or id"""
+    unique = {}
+    for verse in verses:
+        verse_key = verse.get('verse_number') or verse.get('id')
+        if verse_key and verse_key not in unique:
+            unique[verse_key] = verse
+            if len(unique) >= limit:
+                break
+    return list(unique.values())
 
 class ChatService:
     def __init__(self):
         # Initialize verse service and get all verses for matching
-        self.verse_service = VerseService()
+        self.verse_service = get_verse_service()
         self.groq_client = groq_client
         self.prompts = PROMPT_TEMPLATES
         self.conversation_service = ConversationService()
+        self._sentiment_cache = LRUCache(maxsize=SENTIMENT_CACHE_SIZE)
+        self._executor = ThreadPoolExecutor(max_workers=CHAT_WORKER_THREADS, thread_name_prefix="chat")
     
     def process_message(self, user_message: str, conversation_id: Optional[str] = None, user_id: str = "anonymous") -> Dict[str, Any]:
         """
         Process a user message through the complete pipeline
         """
         try:
+            # Step 1: Analyze sentiment and themes. The Groq call only needs the
+            # message, so it runs while the conversation is loaded and updated.
+            sentiment_future = self._executor.submit(self._analyze_sentiment, user_message)
+            
             # Get or create conversation with context
             conversation = self.conversation_service.get_or_create_conversation(user_id)
             conversation_context = self._get_conversation_context(conversation)
@@ -25,15 +82,21 @@ class ChatService:
             # Add user message to conversation
             self.conversation_service.add_message(conversation['id'], user_message, 'user')
             
-            # Step 1: Analyze sentiment and themes
-            sentiment_data = self._analyze_sentiment(user_message)
+            sentiment_data = sentiment_future.result()
             
-            # Step 2: Find relevant verses using both themes and direct semantic search
-            relevant_verses = self._find_relevant_verses(sentiment_data['themes'], user_message)
+            # Step 2: Find relevant verses using both themes and direct semantic search.
+            # Message and theme searches share one batched request, and the message
+            # results are shared with the response step.
+            message_verses, theme_verses = self._search_message_verses(user_message, sentiment_data['themes'])
+            relevant_verses = self._find_relevant_verses(
+                sentiment_data['themes'], user_message,
+                message_verses=message_verses, theme_verses=theme_verses
+            )
             
             # Step 3: Generate AI response with context
             response = self._generate_response(
-                user_message, sentiment_data, relevant_verses, conversation_context
+                user_message, sentiment_data, relevant_verses, conversation_context,
+                message_verses=message_verses
             )
             
             # Add AI response to conversation
@@ -58,68 +121,92 @@ class ChatService:
                 "error": True
             }
     
-    def _analyze_sentiment(self, user_message: str) -> Dict[str, Any]:
+    def _analyze_sentiment(self, user_message: str, use_cache: bool = True) -> Dict[str, Any]:
         """Analyze user message sentiment, themes, and intent"""
+        words = MESSAGE_WORD_PATTERN.findall(user_message.lower())
+        if words and len(words) <= SMALL_TALK_MAX_WORDS and SMALL_TALK_WORDS.issuperset(words):
+            return self._default_sentiment()
+        
+        cache_key = " ".join(user_message.lower().split()) if use_cache else None
+        if cache_key is not None:
+            cached = self._sentiment_cache.get(cache_key)
+            if cached is not None:
+                return dict(cached)
+        
         try:
             prompt = self.prompts.get_sentiment_prompt(user_message)
             response = self.groq_client.generate_structured_response(prompt)
+            # Only cache replies that parsed into a usable analysis
+            if cache_key is not None and 'themes' in response:
+                self._sentiment_cache.set(cache_key, dict(response))
             return response
         except Exception as e:
             logging.error(f"Error analyzing sentiment: {e}")
             # Return default sentiment data if analysis fails
-            return {
-                "sentiment": "neutral",
-                "themes": ["general"],
-                "intent": "general_chat",
-                "confidence": 0.5
-            }
+            return self._default_sentiment()
     
-    def _find_relevant_verses(self, themes: list[str], user_message: str = None) -> list[Dict[str, Any]]:
+    def _default_sentiment(self) -> Dict[str, Any]:
+        """Neutral general-chat analysis used when no Groq analysis is available"""
+        return {
+            "sentiment": "neutral",
+            "themes": ["general"],
+            "intent": "general_chat",
+            "confidence": 0.5
+        }
+    
+    def _search_message_verses(self, user_message: str, themes: Optional[list[str]] = None):
+        """
+        Semantic search on the raw user message (top 3 verses) and on each theme
+        (top 2 verses), all in one batched embedding + Qdrant request.
+        Returns (message_verses, theme_verses) with one verse list per theme.
+        """
+        themes = [theme for theme in themes or [] if theme]
+        try:
+            results = self.verse_service.search_verses_by_themes(
+                [user_message] + themes, max_results=[3] + [2] * len(themes)
+            )
+            return results[0], results[1:]
+        except Exception as e:
+            print(f"Error in semantic search: {e}")
+            return [], []
+    
+    def _find_relevant_verses(self, themes: list[str], user_message: str = None,
+                              message_verses: Optional[list[Dict[str, Any]]] = None,
+                              theme_verses: Optional[list[list[Dict[str, Any]]]] = None) -> list[Dict[str, Any]]:
         """Find relevant Quranic verses using RAG-based semantic search"""
         relevant_verses = []
         
         # First, try semantic search on the original user message if available
-        if user_message:
-            try:
-                message_verses = self.verse_service.search_verses_by_theme(
-                    user_message, 
-                    max_results=3
-                )
-                relevant_verses.extend(message_verses)
-            except Exception as e:
-                print(f"Error in semantic search: {e}")
+        if message_verses is None and user_message:
+            message_verses, theme_verses = self._search_message_verses(user_message, themes)
+        if message_verses:
+            relevant_verses.extend(message_verses)
         
-        # Then search by themes
-        for theme in themes:
+        # Then search by themes, all in one batched embedding + Qdrant request
+        if theme_verses is None and themes:
             try:
-                verses = self.verse_service.search_verses_by_theme(theme, max_results=2)
-                relevant_verses.extend(verses)
+                theme_verses = self.verse_service.search_verses_by_themes(themes, max_results=2)
             except Exception as e:
-                print(f"Error searching by theme '{theme}': {e}")
+                print(f"Error searching by themes {themes}: {e}")
+        for verses in theme_verses or []:
+            relevant_verses.extend(verses)
         
         # Remove duplicates and limit to top 3
-        seen_verses = set()
-        unique_verses = []
-        for verse in relevant_verses:
-            verse_key = verse.get('verse_number', verse.get('id', ''))
-            if verse_key and verse_key not in seen_verses:
-                seen_verses.add(verse_key)
-                unique_verses.append(verse)
-                if len(unique_verses) >= 3:
-                    break
-        
-        return unique_verses
+        return _unique_verses(relevant_verses, 3)
     
     def _generate_response(self, user_message: str, sentiment_data: Dict[str, Any], 
-                           verses: list[Dict[str, Any]], conversation_context: Dict[str, Any] = None) -> Dict[str, Any]:
+                           verses: list[Dict[str, Any]], conversation_context: Dict[str, Any] = None,
+                           message_verses: Optional[list[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """Generate dynamic response with automatic verse checking"""
         intent = sentiment_data.get('intent', 'general_chat')
         
         # Always check for relevant verses using the user's message
         relevant_verses = []
         try:
-            # Search for verses related to the user's message
-            search_verses = self.verse_service.search_verses_by_theme(user_message, max_results=3)
+            # Reuse the message search from process_message when provided
+            search_verses = message_verses
+            if search_verses is None:
+                search_verses = self.verse_service.search_verses_by_theme(user_message, max_results=3)
             
             # Include verses if they have good relevance (similarity > 0.3)
             if search_verses:
@@ -451,11 +538,9 @@ class ChatService:
         user_messages = [msg for msg in recent_messages if msg['sender'] == 'user']
         recent_themes = []
         for msg in user_messages:
-            content = msg['content'].lower()
-            if any(word in content for word in ['sad', 'down', 'depressed', 'upset']):
-                recent_themes.append('emotional_support')
-            elif any(word in content for word in ['blessed', 'good', 'happy', 'well']):
-                recent_themes.append('positive')
+            tone = _message_tone(msg['content'])
+            if tone:
+                recent_themes.append(tone)
         
         return {
             "is_new_conversation": is_new_conversation,
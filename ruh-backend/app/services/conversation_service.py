@@ -1,14 +1,12 @@
-import uuid
 from datetime import datetime
 from typing import List, Dict, Optional
-from app.services.verse_service import VerseService
+from app.services.verse_service import get_verse_service
 from app.models.database import SessionLocal
 from app.models.conversation import Conversation, Message
-from sqlalchemy.orm import Session
 
 class ConversationService:
     def __init__(self):
-        self.verse_service = VerseService()
+        self.verse_service = get_verse_service()
 
     def start_conversation(self, user_id: str, initial_message: Optional[str] = None) -> Dict:
         """Start a new conversation for a user."""
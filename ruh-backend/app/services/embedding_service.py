@@ -3,14 +3,39 @@ Embedding Service for generating vector embeddings for verses and user queries.
 Uses sentence-transformers for multilingual support including Arabic text.
 """
 
+import os
 import numpy as np
 from sentence_transformers import SentenceTransformer
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional, Union
+from functools import lru_cache
 from pathlib import Path
+from app.utils.cache import LRUCache
+
+
+# Query model; must match the model ruh-embedding-db/setup.py used to build the
+# Qdrant collection (both read EMBEDDING_MODEL) or searches compare unrelated vectors
+EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL", "paraphrase-multilingual-MiniLM-L12-v2")
+
+
+@lru_cache(maxsize=32)
+def _search_params(top_k: int):
+    """Qdrant search parameters shared by single and batched verse searches, built once per top_k."""
+    from qdrant_client.http import models
+    
+    # HNSW beam width at query time; must be >= limit to return top_k hits.
+    # With a quantized collection, score oversampled candidates on the compressed
+    # vectors first, then rescore them with the original float32 vectors.
+    return models.SearchParams(
+        hnsw_ef=max(128, top_k),
+        quantization=models.QuantizationSearchParams(
+            rescore=True,
+            oversampling=2.0
+        )
+    )
 
 
 class EmbeddingService:
-    def __init__(self, model_name: str = "paraphrase-multilingual-MiniLM-L12-v2"):
+    def __init__(self, model_name: str = EMBEDDING_MODEL):
         """
         Initialize the embedding service with a multilingual model that supports Arabic.
         
@@ -22,6 +47,8 @@ class EmbeddingService:
         self.verse_embeddings = None
         self.verse_metadata = None
         self.embeddings_file = Path("app/data/verse_embeddings.pkl")
+        # Repeated queries (themes, common chat messages) skip the model forward pass
+        self._query_cache = LRUCache(maxsize=2048)
         
         # Initialize the model
         self._load_model()
@@ -45,6 +72,8 @@ class EmbeddingService:
         """
         Generate embedding for a single text.
         
+        Results are memoized per text; the returned array is read-only.
+        
         Args:
             text: The text to embed
             
@@ -54,14 +83,53 @@ class EmbeddingService:
         if not self.model:
             raise ValueError("Model not loaded")
         
+        cached = self._query_cache.get(text)
+        if cached is not None:
+            return cached
+        
         try:
-            embedding = self.model.encode([text])
-            return embedding[0]
+            embedding = self.model.encode([text])[0]
+            # Shared between callers through the cache, so guard against mutation
+            embedding.setflags(write=False)
+            self._query_cache.set(text, embedding)
+            return embedding
         except Exception as e:
             print(f"Error generating embedding for text: {e}")
             raise e
     
-    def find_similar_verses(self, query: str, top_k: int = 5, min_similarity: float = 0.1) -> List[Tuple[Dict[str, Any], float]]:
+    def generate_embeddings(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Generate embeddings for several texts, encoding all uncached texts in one batch.
+        
+        Args:
+            texts: The texts to embed
+            
+        Returns:
+            List of read-only numpy arrays, in the same order as texts
+        """
+        if not self.model:
+            raise ValueError("Model not loaded")
+        
+        embeddings = [self._query_cache.get(text) for text in texts]
+        missing = list(dict.fromkeys(text for text, embedding in zip(texts, embeddings) if embedding is None))
+        
+        if missing:
+            try:
+                encoded = dict(zip(missing, self.model.encode(missing, batch_size=32)))
+            except Exception as e:
+                print(f"Error generating embeddings for {len(missing)} texts: {e}")
+                raise e
+            
+            for text, embedding in encoded.items():
+                embedding.setflags(write=False)
+                self._query_cache.set(text, embedding)
+            embeddings = [embedding if embedding is not None else encoded[text]
+                          for text, embedding in zip(texts, embeddings)]
+        
+        return embeddings
+    
+    def find_similar_verses(self, query: str, top_k: int = 5, min_similarity: float = 0.1,
+                            query_embedding: Optional[np.ndarray] = None) -> List[Tuple[Dict[str, Any], float]]:
         """
         Find verses most similar to the query using Qdrant vector database.
         
@@ -69,6 +137,7 @@ class EmbeddingService:
             query: The user's query text
             top_k: Number of top similar verses to return
             min_similarity: Minimum similarity threshold
+            query_embedding: Precomputed embedding of query, if the caller already has it
             
         Returns:
             List of tuples (verse_metadata, similarity_score) sorted by similarity
@@ -76,26 +145,68 @@ class EmbeddingService:
         from app.core.qdrant_client import qdrant
         
         # Generate embedding for the query
-        query_embedding = self.generate_embedding(query)
+        if query_embedding is None:
+            query_embedding = self.generate_embedding(query)
         
         # Use Qdrant client to search for similar vectors
         collection_name = "quran_embeddings"
         
-        # Search using Qdrant client
-        search_results = qdrant.client.search(
+        # Qdrant already returns the top_k hits in descending score order; the
+        # threshold is applied server-side so no client-side filtering is needed
+        search_results = qdrant.client.query_points(
             collection_name=collection_name,
-            query_vector=query_embedding.tolist(),
-            limit=top_k
-        )
+            query=query_embedding.tolist(),
+            limit=top_k,
+            score_threshold=min_similarity,
+            search_params=_search_params(top_k),
+            with_payload=True
+        ).points
+        
+        return [(result.payload, float(result.score)) for result in search_results]
+    
+    def find_similar_verses_batch(self, queries: List[str], top_k: Union[int, List[int]] = 5,
+                                  min_similarity: float = 0.1,
+                                  query_embeddings: Optional[List[np.ndarray]] = None) -> List[List[Tuple[Dict[str, Any], float]]]:
+        """
+        Find similar verses for several queries with one batched encode and one Qdrant request.
+        
+        Args:
+            queries: The query texts
+            top_k: Number of top similar verses to return, shared or one per query
+            min_similarity: Minimum similarity threshold
+            query_embeddings: Precomputed embeddings of the queries, to skip encoding
+            
+        Returns:
+            One list of (verse_metadata, similarity_score) tuples per query, in query order
+        """
+        from app.core.qdrant_client import qdrant
+        from qdrant_client.http import models
+        
+        if not queries:
+            return []
         
-        results = []
-        for result in search_results:
-            similarity_score = result.score
-            if similarity_score >= min_similarity:
-                verse_data = result.payload
-                results.append((verse_data, float(similarity_score)))
+        if query_embeddings is None:
+            query_embeddings = self.generate_embeddings(queries)
+        top_ks = top_k if isinstance(top_k, list) else [top_k] * len(queries)
+        
+        batch_results = qdrant.client.query_batch_points(
+            collection_name="quran_embeddings",
+            requests=[
+                models.QueryRequest(
+                    query=query_embedding.tolist(),
+                    limit=limit,
+                    score_threshold=min_similarity,
+                    params=_search_params(limit),
+                    with_payload=True
+                )
+                for query_embedding, limit in zip(query_embeddings, top_ks)
+            ]
+        )
         
-        return results
+        return [
+            [(result.payload, float(result.score)) for result in response.points]
+            for response in batch_results
+        ]
     
     def get_embedding_stats(self) -> Dict[str, Any]:
         """
@@ -1,9 +1,92 @@
+import json
 import logging
+import os
+import threading
 from app.core.groq_client import groq_client
+from app.utils.cache import LRUCache
+
+# Append-only JSON Lines file of {"arabic_text": ..., "translation": ...} records,
+# replayed on startup so translations survive restarts
+TRANSLATION_CACHE_PATH = os.environ.get("TRANSLATION_CACHE_PATH", "app/data/translation_cache.jsonl")
+# In-memory translations; sized to hold every verse of the Quran (6236)
+TRANSLATION_CACHE_SIZE = 8192
+# /translate accepts arbitrary text and evicted entries are re-appended when translated
+# again, so once the file reaches this many lines it is rewritten from the in-memory cache
+TRANSLATION_CACHE_MAX_LINES = 2 * TRANSLATION_CACHE_SIZE
 
 class TranslationService:
-    def __init__(self):
+    def __init__(self, cache_path: str = TRANSLATION_CACHE_PATH):
         self.groq_client = groq_client
+        # Verse text is fixed, so a translation only needs to be generated once
+        self._translations = LRUCache(maxsize=TRANSLATION_CACHE_SIZE)
+        self.cache_path = cache_path
+        self._cache_file_lock = threading.Lock()
+        self._cache_file_lines = 0
+        self._load_cached_translations()
+    
+    def _load_cached_translations(self):
+        """
+        Replay previously generated translations from the cache file, if present.
+        The file is compacted afterwards if it held duplicates or malformed lines.
+        """
+        if not os.path.exists(self.cache_path):
+            return
+        
+        lines = 0
+        malformed = 0
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        record = json.loads(line)
+                        self._translations.set(record['arabic_text'], record['translation'])
+                    except (ValueError, KeyError, TypeError):
+                        # Skip a truncated or malformed line rather than dropping the whole cache
+                        malformed += 1
+            logging.info(f"Loaded {len(self._translations)} cached translations")
+        except OSError as e:
+            logging.error(f"Could not read translation cache: {e}")
+            return
+        
+        self._cache_file_lines = lines
+        # A truncated last line has no newline, so the next append would be glued to it
+        if malformed or lines > len(self._translations):
+            with self._cache_file_lock:
+                self._compact_cache_file()
+    
+    def _persist_translation(self, arabic_text, translation):
+        """Append one new translation to the cache file, compacting it when it is full."""
+        record = json.dumps({'arabic_text': arabic_text, 'translation': translation}, ensure_ascii=False)
+        try:
+            with self._cache_file_lock:
+                if self._cache_file_lines >= TRANSLATION_CACHE_MAX_LINES:
+                    # The in-memory cache already holds the new translation
+                    self._compact_cache_file()
+                    return
+                os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+                with open(self.cache_path, 'a', encoding='utf-8') as f:
+                    f.write(record + '\n')
+                self._cache_file_lines += 1
+        except OSError as e:
+            logging.error(f"Could not write translation cache: {e}")
+    
+    def _compact_cache_file(self):
+        """
+        Rewrite the cache file from the in-memory cache, least recently used first,
+        so replay restores the same order. Callers hold _cache_file_lock.
+        """
+        entries = self._translations.items()
+        tmp_path = self.cache_path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for arabic_text, translation in entries:
+                    f.write(json.dumps({'arabic_text': arabic_text, 'translation': translation}, ensure_ascii=False) + '\n')
+            os.replace(tmp_path, self.cache_path)
+            self._cache_file_lines = len(entries)
+        except OSError as e:
+            logging.error(f"Could not compact translation cache: {e}")
     
     def translate_arabic_to_english(self, arabic_text):
         """
@@ -21,6 +104,14 @@ class TranslationService:
                 'status': 'error'
             }
             
+        arabic_text = arabic_text.strip()
+        cached_translation = self._translations.get(arabic_text)
+        if cached_translation is not None:
+            return {
+                'translation': cached_translation,
+                'status': 'success'
+            }
+        
         # Define system prompt and user prompt
         system_prompt = "You are a professional translator specializing in Arabic to English translation of Quranic verses. Provide only the English translation without any additional commentary, explanations, or formatting. Return only the translation text."
         user_prompt = f"Translate this Arabic Quranic verse to English: {arabic_text}"
@@ -35,8 +126,12 @@ class TranslationService:
                 model="llama-3.1-8b-instant"
             )
             
+            translation = translation.strip()
+            self._translations.set(arabic_text, translation)
+            self._persist_translation(arabic_text, translation)
+            
             return {
-                'translation': translation.strip(),
+                'translation': translation,
                 'status': 'success'
             }
             
@@ -3,14 +3,13 @@ Vector Store for managing verse embeddings with persistence and efficient retrie
 Provides a simple in-memory vector database with disk persistence.
 """
 
+import os
 import numpy as np
-import pickle
 import json
 from pathlib import Path
 from typing import List, Dict, Any, Tuple, Optional
 from datetime import datetime
 import threading
-import time
 
 
 class VectorStore:
@@ -34,6 +33,8 @@ class VectorStore:
         self.metadata = []
         self.index = {}
         self.dimension = None
+        # Row norms of self.vectors, computed on first search and reset whenever vectors change
+        self._vector_norms = None
         
         # Thread safety
         self._lock = threading.RLock()
@@ -65,6 +66,7 @@ class VectorStore:
                 if vectors.shape[1] != self.dimension:
                     raise ValueError(f"Vector dimension {vectors.shape[1]} doesn't match store dimension {self.dimension}")
                 self.vectors = np.vstack([self.vectors, vectors])
+            self._vector_norms = None
             
             # Generate IDs if not provided
             if ids is None:
@@ -108,38 +110,45 @@ class VectorStore:
             if query_norm == 0:
                 return []
             
-            vector_norms = np.linalg.norm(self.vectors, axis=1)
+            if self._vector_norms is None:
+                self._vector_norms = np.linalg.norm(self.vectors, axis=1)
+            vector_norms = self._vector_norms
             valid_indices = vector_norms > 0
             
             if not np.any(valid_indices):
                 return []
             
-            # Compute cosine similarity only for valid vectors
-            similarities = np.zeros(len(self.vectors))
-            valid_vectors = self.vectors[valid_indices]
-            valid_norms = vector_norms[valid_indices]
+            # One matrix-vector product for all rows; zero-norm rows keep similarity 0
+            dot_products = np.dot(self.vectors, query_vector)
+            similarities = dot_products / (np.where(valid_indices, vector_norms, 1.0) * query_norm)
             
-            dot_products = np.dot(valid_vectors, query_vector)
-            similarities[valid_indices] = dot_products / (valid_norms * query_norm)
+            # Threshold as a vectorized mask, then apply metadata filters to survivors only
+            candidates = np.flatnonzero(similarities >= min_similarity)
+            if filter_metadata is not None:
+                candidates = np.array(
+                    [i for i in candidates if self._matches_filter(self.metadata[i], filter_metadata)],
+                    dtype=np.intp
+                )
             
-            # Apply metadata filters
-            valid_indices_list = []
-            for i, meta in enumerate(self.metadata):
-                if similarities[i] >= min_similarity:
-                    if filter_metadata is None or self._matches_filter(meta, filter_metadata):
-                        valid_indices_list.append(i)
-            
-            if not valid_indices_list:
+            if len(candidates) == 0:
                 return []
             
-            # Sort by similarity and get top-k
-            valid_similarities = [(i, similarities[i]) for i in valid_indices_list]
-            valid_similarities.sort(key=lambda x: x[1], reverse=True)
+            # Find the k-th best score in O(n) and keep every candidate scoring at least
+            # that, so only about k scores are sorted. argpartition picks arbitrarily
+            # among ties at the boundary, so all of them are kept and the stable sort
+            # below returns ties in insertion order.
+            candidate_similarities = similarities[candidates]
+            if 0 < top_k < len(candidates):
+                kth_similarity = -np.partition(-candidate_similarities, top_k - 1)[top_k - 1]
+                top = np.flatnonzero(candidate_similarities >= kth_similarity)
+                candidates, candidate_similarities = candidates[top], candidate_similarities[top]
+            
+            order = candidates[np.argsort(-candidate_similarities, kind='stable')][:top_k]
             
             results = []
-            for i, similarity in valid_similarities[:top_k]:
+            for i in order:
                 vector_id = self.metadata[i]['id']
-                results.append((vector_id, self.metadata[i], float(similarity)))
+                results.append((vector_id, self.metadata[i], float(similarities[i])))
             
             return results
     
@@ -178,6 +187,7 @@ class VectorStore:
             
             # Remove from vectors array
             self.vectors = np.delete(self.vectors, idx, axis=0)
+            self._vector_norms = None
             
             # Remove metadata
             del self.metadata[idx]
@@ -223,9 +233,12 @@ class VectorStore:
         """
         try:
             with self._lock:
-                # Save vectors
+                # Save vectors. Write to a temp file and swap it in, since the current
+                # file may be memory-mapped by this or another process.
                 if self.vectors is not None:
-                    np.save(self.vectors_file, self.vectors)
+                    tmp_file = self.vectors_file.with_suffix('.tmp.npy')
+                    np.save(tmp_file, self.vectors)
+                    os.replace(tmp_file, self.vectors_file)
                 
                 # Save metadata
                 with open(self.metadata_file, 'w', encoding='utf-8') as f:
@@ -251,7 +264,10 @@ class VectorStore:
             with self._lock:
                 # Load vectors
                 if self.vectors_file.exists():
-                    self.vectors = np.load(self.vectors_file)
+                    # Memory-map read-only so worker processes share one page cache;
+                    # add_vectors/delete build new arrays rather than writing in place
+                    self.vectors = np.load(self.vectors_file, mmap_mode='r')
+                    self._vector_norms = None
                     self.dimension = self.vectors.shape[1] if len(self.vectors) > 0 else None
                 
                 # Load metadata
@@ -276,6 +292,7 @@ class VectorStore:
             self.metadata = []
             self.index = {}
             self.dimension = None
+            self._vector_norms = None
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -1,28 +1,113 @@
-from typing import List, Dict, Optional, Tuple
-from .embedding_service import EmbeddingService
-from .vector_store import VectorStoreManager
-from app.core.groq_client import groq_client
-from app.core.prompts import PROMPT_TEMPLATES
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from typing import List, Dict, Optional, Tuple, Union
 from app.core.qdrant_client import qdrant
+from app.utils.cache import LRUCache, SemanticCache
+
+# Common words ignored when extracting keywords from a search theme
+STOP_WORDS = frozenset({'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'a', 'an'})
+
+# Related terms that signal a concept even when the theme word itself is absent
+SEMANTIC_INDICATORS = {
+    'prayer': ['worship', 'devotion', 'praise', 'glorify', 'remember'],
+    'guidance': ['path', 'way', 'direction', 'lead', 'guide'],
+    'mercy': ['compassion', 'forgiveness', 'kindness', 'grace'],
+    'patience': ['perseverance', 'endurance', 'steadfast', 'bear'],
+    'faith': ['believe', 'trust', 'conviction', 'certainty'],
+    'justice': ['fair', 'right', 'equity', 'balance'],
+    'knowledge': ['wisdom', 'understanding', 'learn', 'teach']
+}
+
+# Theme mapping for semantic analysis of verse text
+THEME_PATTERNS = {
+    'prayer': ['pray', 'worship', 'devotion', 'praise', 'glorify', 'remember allah', 'salah'],
+    'guidance': ['guide', 'path', 'way', 'direction', 'lead', 'straight path', 'guidance'],
+    'mercy': ['mercy', 'compassion', 'forgiveness', 'kindness', 'grace', 'merciful'],
+    'patience': ['patience', 'perseverance', 'endurance', 'steadfast', 'bear', 'patient'],
+    'faith': ['faith', 'believe', 'trust', 'conviction', 'certainty', 'believers'],
+    'justice': ['justice', 'fair', 'right', 'equity', 'balance', 'just'],
+    'knowledge': ['knowledge', 'wisdom', 'understanding', 'learn', 'teach', 'know'],
+    'charity': ['charity', 'give', 'spend', 'poor', 'needy', 'zakah'],
+    'forgiveness': ['forgive', 'pardon', 'mercy', 'repent', 'repentance'],
+    'gratitude': ['grateful', 'thank', 'praise', 'appreciate', 'blessing']
+}
+
+# Each pattern maps to every theme whose patterns it contains, so a single
+# longest-first match still reports the shorter patterns nested inside it
+# (e.g. 'forgiveness' also yields the 'forgive' theme).
+_THEME_PATTERN_THEMES: Dict[str, frozenset] = {
+    pattern: frozenset(
+        theme for theme, patterns in THEME_PATTERNS.items()
+        if any(other in pattern for other in patterns)
+    )
+    for patterns in THEME_PATTERNS.values()
+    for pattern in patterns
+}
+
+# One compiled alternation over all theme patterns. The zero-width lookahead lets
+# finditer report a match at every offset, so overlapping patterns are not lost.
+_THEME_PATTERN_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(p) for p in sorted(_THEME_PATTERN_THEMES, key=len, reverse=True)) + '))'
+)
+
+# All semantic indicators in one alternation (longest first, zero-width lookahead
+# so overlapping matches are reported), mapped to every indicator each match
+# contains, so a single scan finds exactly the indicators present in a verse.
+_SEMANTIC_INDICATOR_WORDS = frozenset(
+    indicator for indicators in SEMANTIC_INDICATORS.values() for indicator in indicators
+)
+_SEMANTIC_INDICATOR_CONTAINS: Dict[str, frozenset] = {
+    indicator: frozenset(other for other in _SEMANTIC_INDICATOR_WORDS if other in indicator)
+    for indicator in _SEMANTIC_INDICATOR_WORDS
+}
+_SEMANTIC_INDICATOR_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(i) for i in sorted(_SEMANTIC_INDICATOR_WORDS, key=len, reverse=True)) + '))'
+)
+
+# Word tokens in a search theme
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+# Payload fields read when listing chapter verses
+VERSE_PAYLOAD_FIELDS = ['verse_number', 'arabic_text', 'surah_number', 'surah_name', 'revelation_place', 'surah_summary']
+
+# Payload fields read when building the surah index (no verse text needed)
+SURAH_INDEX_PAYLOAD_FIELDS = ['surah_number', 'surah_name', 'revelation_place']
+
+# Points fetched per Qdrant scroll request
+SCROLL_BATCH_SIZE = 1024
+
+# Inclusive surah_number ranges scrolled in parallel when building the surah index.
+# The early surahs are the longest, so the ranges widen to keep point counts similar.
+SURAH_SCAN_PARTITIONS = ((1, 4), (5, 10), (11, 27), (28, 114))
 
 class VerseService:
-    _instance = None
-    _initialized = False
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(VerseService, cls).__new__(cls)
-        return cls._instance
-    
     def __init__(self):
-        if not self._initialized:
+        # Initialize RAG components lazily
+        self.embedding_service = None
+        self.vector_store_manager = None
+        self.verse_store = None
         
-            # Initialize RAG components lazily
-            self.embedding_service = None
-            self.vector_store_manager = None
-            self.verse_store = None
-            
-            VerseService._initialized = True
+        # Chapter metadata is static, so it is built once on first use
+        self._surah_entries = None
+        self._chapter_haystacks: Optional[List[Tuple[str, str, str, str]]] = None
+        self._surah_info_by_number: Optional[Dict[int, Dict]] = None
+        # Serializes the cold surah-index scan so concurrent first requests share one scan
+        self._surah_index_lock = threading.Lock()
+        self._all_chapters = None
+        # surah_number -> verses fetched from Qdrant, filled as chapters are requested
+        self._verses_by_surah: Dict[int, List[Dict]] = {}
+        # Chapter summaries are stored once per surah rather than on every verse
+        self._surah_summaries: Dict[int, str] = {}
+        self._chapters_by_number: Dict[int, Dict] = {}
+        # Semantic search results keyed by (query, max_results). Keys are not
+        # case-folded because the embedding model is case-sensitive.
+        self._verse_search_cache = LRUCache(maxsize=512)
+        self._chapter_search_cache = LRUCache(maxsize=512)
+        # Near-duplicate verse queries (cosine >= 0.98) reuse an earlier result
+        self._verse_semantic_cache = SemanticCache(maxsize=512, threshold=0.98)
 
     def search_verses_by_theme(self, theme: str, max_results: int = 5, sort_by: str = 'relevance') -> List[Dict]:
         """
@@ -33,38 +118,35 @@ class VerseService:
         if not theme:
             return []
         
+        cache_key = (theme.strip(), max_results)
+        cached_results = self._verse_search_cache.get(cache_key)
+        if cached_results is not None:
+            return cached_results
+        
         # Ensure embeddings are initialized
         self._ensure_embeddings_initialized()
         
         try:
+            query_embedding = self.embedding_service.generate_embedding(theme)
+            
+            # A near-identical earlier query with the same max_results has the same answer
+            cached_results = self._verse_semantic_cache.get(query_embedding, namespace=max_results)
+            if cached_results is not None:
+                self._verse_search_cache.set(cache_key, cached_results)
+                return cached_results
+            
             # Try semantic search first
             similar_verses = self.embedding_service.find_similar_verses(
                 query=theme, 
                 top_k=max_results, 
-                min_similarity=0.1
+                min_similarity=0.1,
+                query_embedding=query_embedding
             )
             
             if similar_verses:
-                # Convert to the expected format with chapter information
-                results = []
-                for verse_data, similarity_score in similar_verses:
-                    # Add similarity score to metadata for debugging/ranking
-                    verse_data['similarity_score'] = similarity_score
-                    
-                    # Extract chapter information directly from verse data
-                    surah_number = verse_data.get('surah_number')
-                    if surah_number:
-                        verse_data['chapter_info'] = {
-                            'surah_number': surah_number,
-                            'name': verse_data.get('surah_name', ''),
-                            'revelation_place': verse_data.get('revelation_place', ''),
-                            'verses_count': verse_data.get('verses_count', 0),
-                            'summary': verse_data.get('surah_summary', '')
-                        }
-                    
-                    results.append(verse_data)
-
-                    print(results)
+                results = self._format_verse_results(similar_verses)
+                self._verse_search_cache.set(cache_key, results)
+                self._verse_semantic_cache.set(query_embedding, results, namespace=max_results)
                 return results
             
         except Exception as e:
@@ -74,20 +156,164 @@ class VerseService:
         return [] 
     
     
+    def search_verses_by_themes(self, themes: List[str], max_results: Union[int, List[int]] = 5) -> List[List[Dict]]:
+        """
+        Search verses for several themes at once: one batched embedding pass and
+        one Qdrant batch request instead of a round trip per theme.
+        max_results is either shared by all themes or given per theme.
+        Themes already answered by the search caches are not searched again.
+        Returns one result list per non-empty theme, in input order.
+        """
+        if isinstance(max_results, int):
+            max_results = [max_results] * len(themes)
+        queries = [(theme, limit) for theme, limit in zip(themes, max_results) if theme]
+        if not queries:
+            return []
+        themes = [theme for theme, _ in queries]
+        max_results = [limit for _, limit in queries]
+        
+        results = [self._verse_search_cache.get((theme.strip(), limit)) for theme, limit in queries]
+        missing = [i for i, cached_results in enumerate(results) if cached_results is None]
+        if not missing:
+            return results
+        
+        self._ensure_embeddings_initialized()
+        
+        try:
+            embeddings = self.embedding_service.generate_embeddings([themes[i] for i in missing])
+            
+            to_search = []
+            for i, query_embedding in zip(missing, embeddings):
+                cached_results = self._verse_semantic_cache.get(query_embedding, namespace=max_results[i])
+                if cached_results is not None:
+                    self._verse_search_cache.set((themes[i].strip(), max_results[i]), cached_results)
+                    results[i] = cached_results
+                else:
+                    to_search.append((i, query_embedding))
+            
+            if to_search:
+                batch_results = self.embedding_service.find_similar_verses_batch(
+                    [themes[i] for i, _ in to_search],
+                    top_k=[max_results[i] for i, _ in to_search],
+                    min_similarity=0.1,
+                    query_embeddings=[query_embedding for _, query_embedding in to_search]
+                )
+                for (i, query_embedding), similar_verses in zip(to_search, batch_results):
+                    results[i] = self._format_verse_results(similar_verses)
+                    if results[i]:
+                        self._verse_search_cache.set((themes[i].strip(), max_results[i]), results[i])
+                        self._verse_semantic_cache.set(query_embedding, results[i], namespace=max_results[i])
+        except Exception as e:
+            print(f"Batched semantic search failed: {e}")
+        
+        return [theme_results if theme_results is not None else [] for theme_results in results]
+    
+    def _format_verse_results(self, similar_verses: List[Tuple[Dict, float]]) -> List[Dict]:
+        """Convert (payload, score) search hits to verse dicts with chapter information."""
+        results = []
+        for verse_data, similarity_score in similar_verses:
+            # Add similarity score to metadata for debugging/ranking
+            verse_data['similarity_score'] = similarity_score
+            
+            # Extract chapter information directly from verse data
+            surah_number = verse_data.get('surah_number')
+            if surah_number:
+                surah_info = self.get_surah_info(surah_number) or {}
+                verse_data['chapter_info'] = {
+                    'surah_number': surah_number,
+                    'name': verse_data.get('surah_name', ''),
+                    'revelation_place': verse_data.get('revelation_place', ''),
+                    'verses_count': surah_info.get('number_of_verses', 0),
+                    'summary': verse_data.get('surah_summary', '')
+                }
+            
+            results.append(verse_data)
+        
+        return results
+    
+    def get_surah_info(self, surah_number: int) -> Optional[Dict]:
+        """
+        Get the cached surah entry (name, number_of_verses, revelation_place) by number.
+        Never scans: returns None until the surah index has been built, either by
+        warm_surah_index at startup or by a chapter request.
+        """
+        return (self._surah_info_by_number or {}).get(surah_number)
+    
+    def _scroll_surah_range(self, client, collection_name: str, first_surah: int, last_surah: int) -> List[Dict]:
+        """
+        Scroll the surah-index payloads for surahs first_surah..last_surah (inclusive).
+        Errors propagate so a partial scan is never cached.
+        """
+        range_filter = {
+            "must": [
+                {
+                    "key": "surah_number",
+                    "range": {"gte": first_surah, "lte": last_surah}
+                }
+            ]
+        }
+        
+        payloads = []
+        scroll_cursor = None
+        
+        while True:
+            points, scroll_cursor = client.scroll(
+                collection_name=collection_name,
+                scroll_filter=range_filter,
+                limit=SCROLL_BATCH_SIZE,
+                offset=scroll_cursor,
+                with_payload=SURAH_INDEX_PAYLOAD_FIELDS,
+                with_vectors=False
+            )
+            
+            # Scrolled records always carry a payload attribute, possibly None
+            payloads.extend(point.payload for point in points if point.payload)
+            
+            if not points or not scroll_cursor:
+                break
+        
+        print(f"Retrieved {len(payloads)} points for surahs {first_surah}-{last_surah}")
+        return payloads
+    
     def _ensure_embeddings_initialized(self):
         """
         Lazy initialization of embedding components only when needed.
         """
         if self.embedding_service is None:
+            # Imported here so loading this module does not pull in sentence-transformers/torch
+            from .embedding_service import EmbeddingService
+            from .vector_store import VectorStoreManager
+            
             self.embedding_service = EmbeddingService()
             self.vector_store_manager = VectorStoreManager()
             self.verse_store = self.vector_store_manager.get_store("verses")
     
 
+    def warm_surah_index(self) -> threading.Thread:
+        """Build the surah index on a background thread so no request pays for the scan."""
+        thread = threading.Thread(target=self.get_first_entries_per_surah, name="surah-index", daemon=True)
+        thread.start()
+        return thread
+
     def get_first_entries_per_surah(self) -> List[Dict]:
         """
         Get all entries from the Qdrant vector database, grouped by surah number and ordered ascending.
         Returns a list of entries with surah information.
+        The scan runs once per process; later calls reuse the cached index.
+        """
+        if self._surah_entries is not None:
+            return self._surah_entries
+        
+        with self._surah_index_lock:
+            # Another request may have finished the scan while we waited
+            if self._surah_entries is not None:
+                return self._surah_entries
+            return self._scan_surah_entries()
+    
+    def _scan_surah_entries(self) -> List[Dict]:
+        """
+        Scroll the whole collection once to build the surah index.
+        Caches the result on success.
         """
         try:
             from app.core.qdrant_client import qdrant
@@ -100,59 +326,43 @@ class VerseService:
             
             print(f"Using collection: {collection_name}")
             
-            # Dictionary to store surah information and count verses
+            # First payload seen for each surah supplies its metadata; verses are tallied separately
             surah_info = {}  # surah_number -> {surah_name, surah_number, number_of_verses, revelation_place}
-            
-            scroll_cursor = None
-            
-            while True:
-                # Scroll through points
-                try:
-                    points, scroll_cursor = qdrant.scroll_points(
-                        collection_name=collection_name,
-                        batch_size=100,
-                        scroll_filter=None,
-                        scroll_cursor=scroll_cursor
-                    )
-                    
-                    print(f"Retrieved {len(points)} points from Qdrant")
-                    
-                    if not points:
-                        print("No points returned from scroll")
-                        break
-                    
-                    for point in points:
-                        # Process each point
-                        if hasattr(point, 'payload') and point.payload:
-                            surah_number = point.payload.get("surah_number")
-                            
-                            if surah_number:
-                                if surah_number not in surah_info:
-                                    # Create new entry for this surah
-                                    surah_info[surah_number] = {
-                                        "surah_name": point.payload.get("surah_name", ""),
-                                        "surah_number": surah_number,
-                                        "number_of_verses": 1,  # Start counting verses
-                                        "revelation_place": point.payload.get("revelation_place", "")
-                                    }
-                                else:
-                                    # Increment verse count for existing surah
-                                    surah_info[surah_number]["number_of_verses"] += 1
-                    
-                    # Break if no more points
-                    if not scroll_cursor:
-                        print("No more scroll cursor, ending search")
-                        break
+            verse_counts = Counter()
+            
+            # Scroll disjoint surah ranges concurrently; each range is its own cursor chain.
+            # Create the client up front so the worker threads share one connection pool.
+            client = qdrant.client
+            with ThreadPoolExecutor(max_workers=len(SURAH_SCAN_PARTITIONS)) as executor:
+                range_payloads = executor.map(
+                    lambda surah_range: self._scroll_surah_range(client, collection_name, *surah_range),
+                    SURAH_SCAN_PARTITIONS
+                )
+                
+                for payloads in range_payloads:
+                    for payload in payloads:
+                        surah_number = payload.get("surah_number")
                         
-                except Exception as inner_e:
-                    print(f"Error during scroll: {str(inner_e)}")
-                    break
+                        if surah_number:
+                            verse_counts[surah_number] += 1
+                            if surah_number not in surah_info:
+                                surah_info[surah_number] = {
+                                    "surah_name": payload.get("surah_name", ""),
+                                    "surah_number": surah_number,
+                                    "revelation_place": payload.get("revelation_place", "")
+                                }
+            
+            for surah_number, info in surah_info.items():
+                info["number_of_verses"] = verse_counts[surah_number]
             
             # Convert dictionary to list and sort by surah number
             result = list(surah_info.values())
             result.sort(key=lambda x: x["surah_number"])
             
             print(f"Returning {len(result)} surah entries")
+            if result:
+                self._surah_entries = result
+                self._surah_info_by_number = {entry["surah_number"]: entry for entry in result}
             return result
             
         except Exception as e:
@@ -162,7 +372,13 @@ class VerseService:
     def search_chapters_by_theme(self, theme: str, max_results: int = 10) -> List[Dict]:
         """
         Enhanced search for chapters by theme with explanations and improved scoring.
+        Semantic results are cached; keyword fallback results are not.
         """
+        cache_key = (theme.strip(), max_results)
+        cached_results = self._chapter_search_cache.get(cache_key)
+        if cached_results is not None:
+            return cached_results
+        
         try:
             # Ensure embedding service is initialized
             self._ensure_embeddings_initialized()
@@ -183,7 +399,14 @@ class VerseService:
             
             # Enhanced aggregation with better scoring
             chapter_info = {}
+            # Per-verse scores kept in flat lists, aggregated per surah with numpy below
+            verse_slots = []
+            verse_similarities = []
+            verse_contextual_scores = []
             theme_keywords = self._extract_theme_keywords(theme)
+            theme_lower = theme.lower()
+            # Indicator lists of the semantic concepts the theme mentions, resolved once per search
+            theme_indicators = self._theme_semantic_indicators(theme_lower)
             
             print(f"Theme keywords: {theme_keywords}")
             
@@ -194,6 +417,8 @@ class VerseService:
                 # Use 'analysis' field for English text, fallback to 'arabic_text'
                 verse_text = verse.get('analysis', '') or verse.get('arabic_text', '')
                 verse_number = verse.get('verse_id', '').split(':')[-1] if verse.get('verse_id') else None
+                # Lowercase once per verse; the scoring helpers all match against this
+                verse_lower = verse_text.lower()
                 
                 print(f"Processing verse: surah={surah_number}, text_length={len(verse_text)}, similarity={similarity_score}")
                 print(f"Verse text preview: '{verse_text[:100]}...' (length: {len(verse_text)})")
@@ -204,20 +429,18 @@ class VerseService:
                         'number_of_verses': verse.get('number_of_verses', 0),
                         'revelation_place': verse.get('revelation_place', ''),
                         'verses': [],
-                        'total_similarity': 0,
-                        'max_similarity': 0,
                         'verse_count': 0,
                         'themes_found': set(),
-                        'contextual_score': 0
+                        'slot': len(chapter_info)
                     }
                 
                 # Enhanced similarity calculation using the actual similarity from the tuple
                 # Boost score for direct keyword matches
-                keyword_boost = sum(1 for keyword in theme_keywords if keyword in verse_text.lower()) * 0.1
+                keyword_boost = sum(1 for keyword in theme_keywords if keyword in verse_lower) * 0.1
                 adjusted_similarity = min(similarity_score + keyword_boost, 1.0)
                 
                 # Calculate contextual relevance
-                contextual_score = self._calculate_contextual_relevance(verse_text, theme, theme_keywords)
+                contextual_score = self._calculate_contextual_relevance(verse_lower, theme_lower, theme_keywords, theme_indicators)
                 
                 chapter_info[surah_number]['verses'].append({
                     'verse_number': verse_number,
@@ -226,32 +449,40 @@ class VerseService:
                     'contextual_score': contextual_score
                 })
                 
-                chapter_info[surah_number]['total_similarity'] += adjusted_similarity
-                chapter_info[surah_number]['max_similarity'] = max(
-                    chapter_info[surah_number]['max_similarity'], 
-                    adjusted_similarity
-                )
-                chapter_info[surah_number]['verse_count'] += 1
-                chapter_info[surah_number]['contextual_score'] += contextual_score
+                verse_slots.append(chapter_info[surah_number]['slot'])
+                verse_similarities.append(adjusted_similarity)
+                verse_contextual_scores.append(contextual_score)
                 
                 # Extract themes from this verse
-                verse_themes = self._extract_themes_from_verse(verse_text, theme)
+                verse_themes = self._extract_themes_from_verse(verse_lower, theme, theme_lower)
                 print(f"Extracted themes for verse: {verse_themes}")
                 chapter_info[surah_number]['themes_found'].update(verse_themes)
             
             print(f"Processed {len(chapter_info)} chapters")
             
+            # Per-surah verse counts, similarity totals/maxima and contextual totals in one pass
+            chapter_count = len(chapter_info)
+            slots = np.asarray(verse_slots, dtype=np.intp)
+            similarities = np.asarray(verse_similarities, dtype=np.float64)
+            verse_counts = np.bincount(slots, minlength=chapter_count)
+            similarity_totals = np.bincount(slots, weights=similarities, minlength=chapter_count)
+            contextual_totals = np.bincount(slots, weights=verse_contextual_scores, minlength=chapter_count)
+            similarity_maxima = np.zeros(chapter_count)
+            np.maximum.at(similarity_maxima, slots, similarities)
+            
             # Enhanced scoring and ranking
             surah_results = []
             for surah_number, info in chapter_info.items():
+                slot = info['slot']
+                info['verse_count'] = int(verse_counts[slot])
                 if info['verse_count'] == 0:
                     continue
                 
                 # Multi-factor scoring
-                avg_similarity = info['total_similarity'] / info['verse_count']
-                max_similarity = info['max_similarity']
+                avg_similarity = float(similarity_totals[slot]) / info['verse_count']
+                max_similarity = float(similarity_maxima[slot])
                 verse_density = min(info['verse_count'] / info['number_of_verses'], 1.0) if info['number_of_verses'] > 0 else 0
-                avg_contextual = info['contextual_score'] / info['verse_count']
+                avg_contextual = float(contextual_totals[slot]) / info['verse_count']
                 theme_diversity = len(info['themes_found'])
                 
                 # Weighted composite score
@@ -289,7 +520,9 @@ class VerseService:
             
             print(f"Returning {len(surah_results)} results")
             
-            return surah_results[:max_results]
+            surah_results = surah_results[:max_results]
+            self._chapter_search_cache.set(cache_key, surah_results)
+            return surah_results
             
         except Exception as e:
             print(f"Error in enhanced chapter search: {e}")
@@ -300,20 +533,23 @@ class VerseService:
     def _extract_theme_keywords(self, theme: str) -> List[str]:
         """Extract key terms from the search theme for enhanced matching."""
         # Simple keyword extraction - could be enhanced with NLP
-        import re
-        
         # Remove common stop words and extract meaningful terms
-        stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'a', 'an'}
-        words = re.findall(r'\b\w+\b', theme.lower())
-        keywords = [word for word in words if word not in stop_words and len(word) > 2]
+        words = WORD_PATTERN.findall(theme.lower())
+        keywords = [word for word in words if word not in STOP_WORDS and len(word) > 2]
         
         return keywords
 
-    def _calculate_contextual_relevance(self, verse_text: str, theme: str, theme_keywords: List[str]) -> float:
-        """Calculate contextual relevance beyond simple keyword matching."""
-        verse_lower = verse_text.lower()
-        theme_lower = theme.lower()
-        
+    def _theme_semantic_indicators(self, theme_lower: str) -> List[List[str]]:
+        """Indicator lists of every semantic concept mentioned in the lowercased theme."""
+        return [indicators for concept, indicators in SEMANTIC_INDICATORS.items() if concept in theme_lower]
+
+    def _calculate_contextual_relevance(self, verse_lower: str, theme_lower: str, theme_keywords: List[str],
+                                        theme_indicators: List[List[str]]) -> float:
+        """Calculate contextual relevance beyond simple keyword matching.
+
+        Expects the verse text and theme already lowercased by the caller, and
+        theme_indicators from _theme_semantic_indicators(theme_lower).
+        """
         # Direct theme mention
         if theme_lower in verse_lower:
             return 0.8
@@ -323,53 +559,30 @@ class VerseService:
         keyword_density = keyword_matches / max(len(theme_keywords), 1)
         
         # Semantic proximity (simplified)
-        semantic_indicators = {
-            'prayer': ['worship', 'devotion', 'praise', 'glorify', 'remember'],
-            'guidance': ['path', 'way', 'direction', 'lead', 'guide'],
-            'mercy': ['compassion', 'forgiveness', 'kindness', 'grace'],
-            'patience': ['perseverance', 'endurance', 'steadfast', 'bear'],
-            'faith': ['believe', 'trust', 'conviction', 'certainty'],
-            'justice': ['fair', 'right', 'equity', 'balance'],
-            'knowledge': ['wisdom', 'understanding', 'learn', 'teach']
-        }
-        
         semantic_score = 0
-        for concept, indicators in semantic_indicators.items():
-            if concept in theme_lower:
-                semantic_score += sum(0.1 for indicator in indicators if indicator in verse_lower)
+        if theme_indicators:
+            found = set()
+            for match in _SEMANTIC_INDICATOR_RE.finditer(verse_lower):
+                found.update(_SEMANTIC_INDICATOR_CONTAINS[match.group(1)])
+            for indicators in theme_indicators:
+                semantic_score += sum(0.1 for indicator in indicators if indicator in found)
         
         return min(keyword_density * 0.6 + semantic_score, 1.0)
 
-    def _extract_themes_from_verse(self, verse_text: str, search_theme: str) -> set:
-        """Extract themes found in a verse based on the search theme and semantic analysis."""
-        verse_lower = verse_text.lower()
-        search_lower = search_theme.lower()
+    def _extract_themes_from_verse(self, verse_lower: str, search_theme: str, search_lower: str) -> set:
+        """Extract themes found in a verse based on the search theme and semantic analysis.
+
+        ``verse_lower`` and ``search_lower`` are the pre-lowercased verse text and theme.
+        """
         themes_found = set()
         
         # Add the main search theme if found
         if search_lower in verse_lower:
             themes_found.add(search_theme)
         
-        # Theme mapping for semantic analysis
-        theme_patterns = {
-            'prayer': ['pray', 'worship', 'devotion', 'praise', 'glorify', 'remember allah', 'salah'],
-            'guidance': ['guide', 'path', 'way', 'direction', 'lead', 'straight path', 'guidance'],
-            'mercy': ['mercy', 'compassion', 'forgiveness', 'kindness', 'grace', 'merciful'],
-            'patience': ['patience', 'perseverance', 'endurance', 'steadfast', 'bear', 'patient'],
-            'faith': ['faith', 'believe', 'trust', 'conviction', 'certainty', 'believers'],
-            'justice': ['justice', 'fair', 'right', 'equity', 'balance', 'just'],
-            'knowledge': ['knowledge', 'wisdom', 'understanding', 'learn', 'teach', 'know'],
-            'charity': ['charity', 'give', 'spend', 'poor', 'needy', 'zakah'],
-            'forgiveness': ['forgive', 'pardon', 'mercy', 'repent', 'repentance'],
-            'gratitude': ['grateful', 'thank', 'praise', 'appreciate', 'blessing']
-        }
-        
-        # Check for theme patterns in the verse
-        for theme, patterns in theme_patterns.items():
-            for pattern in patterns:
-                if pattern in verse_lower:
-                    themes_found.add(theme)
-                    break
+        # Check for theme patterns in the verse with a single regex scan
+        for match in _THEME_PATTERN_RE.finditer(verse_lower):
+            themes_found.update(_THEME_PATTERN_THEMES[match.group(1)])
         
         return themes_found
 
@@ -420,22 +633,27 @@ class VerseService:
         matching_chapters = []
         theme_lower = theme.lower()
         
-        # Get all chapters data (you'll need to implement this or use existing data)
-        all_chapters = self.get_all_chapters()  # This method needs to be implemented
+        # Get all chapters data along with their pre-lowercased searchable fields
+        all_chapters = self.get_all_chapters()
+        haystacks = self._chapter_haystacks or self._build_chapter_haystacks(all_chapters)
         
-        for chapter in all_chapters:
+        for chapter, (name_lower, summary_lower, place_lower, combined) in zip(all_chapters, haystacks):
+            # Single substring test over all fields rejects most chapters
+            if theme_lower not in combined:
+                continue
+            
             match_reasons = []
             
             # Check name match
-            if theme_lower in chapter['name'].lower():
+            if theme_lower in name_lower:
                 match_reasons.append(f"chapter name contains '{theme}'")
             
             # Check summary match
-            if theme_lower in chapter.get('summary', '').lower():
+            if theme_lower in summary_lower:
                 match_reasons.append(f"chapter summary mentions '{theme}'")
             
             # Check revelation place match
-            if theme_lower in chapter['revelation_place'].lower():
+            if theme_lower in place_lower:
                 match_reasons.append(f"revealed in {chapter['revelation_place']}")
             
             if match_reasons:
@@ -447,15 +665,41 @@ class VerseService:
                     "similarity": 0.5  # Default similarity for keyword matches
                 })
                 matching_chapters.append(chapter_with_explanation)
+                if len(matching_chapters) >= max_results:
+                    break
         
         # Limit results
         return matching_chapters[:max_results]
 
+    def _build_chapter_haystacks(self, chapters: List[Dict]) -> List[Tuple[str, str, str, str]]:
+        """
+        Lowercase each chapter's searchable fields once for the keyword fallback.
+        Returns (name, summary, revelation_place, combined) per chapter; the
+        combined string is separated by newlines so matches cannot span fields.
+        """
+        haystacks = []
+        for chapter in chapters:
+            fields = (
+                chapter['name'].lower(),
+                chapter.get('summary', '').lower(),
+                chapter['revelation_place'].lower()
+            )
+            haystacks.append(fields + ("\n".join(fields),))
+        
+        # Only keep the table when it matches the memoized chapter list
+        if chapters is self._all_chapters:
+            self._chapter_haystacks = haystacks
+        return haystacks
+
     def get_all_chapters(self) -> List[Dict]:
         """
         Get basic information about all chapters for fallback search.
         This is a simplified version that returns chapter metadata.
+        The list is built once and reused, since the chapter set never changes.
         """
+        if self._all_chapters is not None:
+            return self._all_chapters
+        
         try:
             # Use the existing method to get first entries per surah
             chapters = self.get_first_entries_per_surah()
@@ -471,6 +715,10 @@ class VerseService:
                     'summary': ''  # Could be enhanced with actual summaries
                 })
             
+            # Only memoize a successful load so a transient Qdrant failure is retried
+            if all_chapters:
+                self._all_chapters = all_chapters
+            
             return all_chapters
             
         except Exception as e:
@@ -479,32 +727,35 @@ class VerseService:
 
     def get_chapter_with_verses(self, surah_number: int) -> Optional[Dict]:
         """
-        Get a chapter with all its verses. Optionally includes translations and summary.
-        Uses Qdrant client to fetch verses when available.
+        Get a chapter with all its verses.
+        Uses Qdrant client to fetch verses when available; the assembled chapter is cached.
         
         Args:
             surah_number: The chapter number
-            include_summary: Whether to generate and include AI summary (default: False)
-            include_translations: Whether to include translations (default: True)
+            
+        Returns:
+            Chapter dictionary, or None if no verses were found for the surah
         """
+        cached_chapter = self._chapters_by_number.get(surah_number)
+        if cached_chapter is not None:
+            return cached_chapter
+        
         # Try to get verses from Qdrant
-        all_surah_verses = self._get_verses_from_qdrant(surah_number) 
-        print(all_surah_verses)
-
-        surah_name = all_surah_verses[0]["surah_name"]
-        ayah_count = len(all_surah_verses)
-        revelation_place = all_surah_verses[0]["revelation_place"]
-        surah_summary = all_surah_verses[0].get('surah_summary', '')
-        print(surah_summary)
+        all_surah_verses = self._get_verses_from_qdrant(surah_number)
+        if not all_surah_verses:
+            return None
+        
+        first_verse = all_surah_verses[0]
         chapter_data = {
             'surah_number': surah_number,
-            'name': surah_name,
-            'ayah_count': ayah_count,
-            'revelation_place': revelation_place,   
+            'name': first_verse["surah_name"],
+            'ayah_count': len(all_surah_verses),
+            'revelation_place': first_verse["revelation_place"],
             'verses': all_surah_verses,
-            'surah_summary': surah_summary
+            'surah_summary': self._surah_summaries.get(surah_number, '')
         }
         
+        self._chapters_by_number[surah_number] = chapter_data
         return chapter_data
         
     def _get_verses_from_qdrant(self, surah_number: int) -> List[Dict]:
@@ -517,6 +768,10 @@ class VerseService:
         Returns:
             List of verse dictionaries
         """
+        cached_verses = self._verses_by_surah.get(surah_number)
+        if cached_verses is not None:
+            return cached_verses
+        
         try:
             # Try to find the right collection
             collection_name = qdrant.find_collection("quran_embeddings")
@@ -540,32 +795,43 @@ class VerseService:
                 # Scroll through points
                 points, scroll_cursor = qdrant.scroll_points(
                     collection_name=collection_name,
-                    batch_size=100,
+                    batch_size=SCROLL_BATCH_SIZE,
                     scroll_filter=surah_filter,
-                    scroll_cursor=scroll_cursor
+                    scroll_cursor=scroll_cursor,
+                    with_payload=VERSE_PAYLOAD_FIELDS
                 )
                 
                 if not points:
                     break
                 
-                for point in points:
-                    if hasattr(point, 'payload') and point.payload:
-                        verse_data = {
-                            'verse_number': point.payload.get('verse_number', ''),
-                            'arabic_text': point.payload.get('arabic_text', ''),
-                            'surah_number': point.payload.get('surah_number', surah_number),
-                            'surah_name': point.payload.get('surah_name', ''),
-                            'revelation_place': point.payload.get('revelation_place', ''),
-                            'surah_summary': point.payload.get('surah_summary', ''),
-                        }
-                        
-                        verses.append(verse_data)
+                for payload in [point.payload for point in points if point.payload]:
+                    # The summary is identical for every verse of the surah; keep one copy
+                    if surah_number not in self._surah_summaries and payload.get('surah_summary'):
+                        self._surah_summaries[surah_number] = payload['surah_summary']
+                    verses.append({
+                        'verse_number': payload.get('verse_number', ''),
+                        'arabic_text': payload.get('arabic_text', ''),
+                        'surah_number': payload.get('surah_number', surah_number),
+                        'surah_name': payload.get('surah_name', ''),
+                        'revelation_place': payload.get('revelation_place', ''),
+                    })
                 
                 if not scroll_cursor:
                     break
             
+            if verses:
+                self._verses_by_surah[surah_number] = verses
+            
             return verses
             
         except Exception as e:
             print(f"Error fetching verses from Qdrant: {str(e)}")
             return []
+
+
+# Shared instance, built once at import; use get_verse_service() instead of constructing VerseService
+verse_service = VerseService()
+
+def get_verse_service() -> VerseService:
+    """Return the process-wide VerseService instance."""
+    return verse_service
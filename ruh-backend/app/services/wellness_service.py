@@ -3,31 +3,78 @@ Wellness Analysis Service for providing Quranic guidance on mental health and we
 Integrates with semantic search to find relevant verses for different wellness categories.
 """
 
-from typing import Dict
-from .verse_service import VerseService
-from app.core.groq_client import groq_client
-from app.models.database import get_db
+from contextvars import ContextVar
+from typing import Dict, Optional
 from app.models.wellness_progress import WellnessProgress
+from app.utils.cache import LRUCache
+from sqlalchemy import func, insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
+import hashlib
 import json
-import re
-from datetime import datetime
+from datetime import datetime, timezone
+from dateutil.parser import isoparse
+
+# Prefer orjson for (de)serializing check-in data and Groq replies when installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# JSON mode guarantees a valid object, so the prompt only describes its shape
+ANALYSIS_SYSTEM_PROMPT = (
+    "Analyze the user's wellness check-ins. Respond with a JSON object: "
+    '{"guidance": "personalized guidance based on Islamic principles", '
+    '"recommendations": ["specific steps to improve wellness"], '
+    '"themes": ["key themes or patterns in the data"]}'
+)
+
+# Status for a failed Groq analysis. groq_client already retries the call, and the
+# frontend retries every 5xx (retryLogic.ts), so a 5xx here would multiply upstream
+# calls during an outage; 424 Failed Dependency is not retried by the client
+GROQ_FAILURE_STATUS = 424
+
+# Groq analyses keyed by (user_id, digest of the serialized check-ins). Only an
+# identical history is reused: any new or edited check-in changes the key, so a
+# user never sees an analysis of older data
+_analysis_cache = LRUCache(maxsize=1024)
+
+# Database session for the current request; bound by the wellness blueprint so
+# the shared service instance never holds a session itself
+_db_session: ContextVar[Optional[Session]] = ContextVar('wellness_db_session', default=None)
+
+
+def bind_db_session(db: Session):
+    """Make db the session used by wellness_service in the current context. Returns a reset token."""
+    return _db_session.set(db)
+
+
+def reset_db_session(token) -> None:
+    """Restore the session binding that was active before bind_db_session."""
+    _db_session.reset(token)
+
+
+class WellnessError(Exception):
+    """
+    A wellness operation failed. Carries the HTTP status and the extra fields
+    of the JSON error body that the app's error handler returns.
+    """
+
+    def __init__(self, message: str, status_code: int = 500, **fields):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.fields = fields
+
+    def to_dict(self) -> Dict:
+        return {"status": "error", "message": self.message, **self.fields}
+
 
 class WellnessService:
-    _instance = None
-    _initialized = False
-    
-    def __new__(cls, db: Session = None):
-        if cls._instance is None:
-            cls._instance = super(WellnessService, cls).__new__(cls)
-        return cls._instance
-    
-    def __init__(self, db: Session = None):
-        if not self._initialized:
-            self.verse_service = VerseService()
-            self.embedding_service = None
-            WellnessService._initialized = True
-        self.db = db
+    @property
+    def db(self) -> Optional[Session]:
+        return _db_session.get()
 
     def get_wellness_history(self, user_id, limit=20, offset=0):
         """
@@ -42,23 +89,47 @@ class WellnessService:
             dict: The tracked progress data with trend analysis for the user.
         """
         try:
-            # Query the database for the user's progress (ordered by timestamp desc)
-            progress_query = self.db.query(WellnessProgress).filter_by(user_id=user_id)
-            total_entries = progress_query.count()
+            # Query the database for the user's progress (ordered by timestamp desc).
+            # The window count returns the user's total on every row, so the page and
+            # the total come back in a single round trip.
+            rows = (
+                self.db.query(
+                    # Plain columns rather than ORM entities: the rows only feed the
+                    # JSON response, so identity-map hydration is wasted work
+                    WellnessProgress.id,
+                    WellnessProgress.mood,
+                    WellnessProgress.energy_level,
+                    WellnessProgress.stress_level,
+                    WellnessProgress.notes,
+                    WellnessProgress.timestamp,
+                    func.count().over().label("total_entries")
+                )
+                .filter(WellnessProgress.user_id == user_id)
+                .order_by(WellnessProgress.timestamp.desc())
+                .offset(offset)
+                .limit(limit)
+                .all()
+            )
             
-            progress = progress_query.order_by(WellnessProgress.timestamp.desc()).offset(offset).limit(limit).all()
+            if rows:
+                total_entries = rows[0].total_entries
+            elif offset > 0:
+                # Paged past the end: no rows to carry the window count
+                total_entries = self.db.query(WellnessProgress).filter_by(user_id=user_id).count()
+            else:
+                total_entries = 0
 
-            # Convert progress data to a list of dictionaries
+            # Convert progress rows to a list of dictionaries
             progress_list = [
                 {
-                    "id": p.id,
-                    "mood": p.mood,
-                    "energy_level": p.energy_level,
-                    "stress_level": p.stress_level,
-                    "notes": p.notes,
-                    "timestamp": p.timestamp.isoformat() if p.timestamp else None
+                    "id": row.id,
+                    "mood": row.mood,
+                    "energy_level": row.energy_level,
+                    "stress_level": row.stress_level,
+                    "notes": row.notes,
+                    "timestamp": row.timestamp.isoformat() if row.timestamp else None
                 }
-                for p in progress
+                for row in rows
             ]
 
             return {
@@ -67,11 +138,8 @@ class WellnessService:
                 "total_entries": total_entries,
                 "wellness_history": progress_list
             }
-        except Exception as e:
-            return {
-                "status": "error",
-                "message": f"An error occurred: {str(e)}"
-            }
+        except SQLAlchemyError as e:
+            raise WellnessError(f"An error occurred: {str(e)}") from e
     
     def process_wellness_checkin(self, mood, energy_level, stress_level, notes="", user_id="default_user"):
         """
@@ -98,118 +166,160 @@ class WellnessService:
                 timestamp=datetime.utcnow()
             )
             
-            # Add to database and commit
+            # Flush to get the generated id, and read the saved values before the
+            # commit expires them; every column is set here, so no refresh is needed
             self.db.add(wellness_entry)
+            self.db.flush()
+            saved_entry = {
+                "id": wellness_entry.id,
+                "user_id": wellness_entry.user_id,
+                "mood": wellness_entry.mood,
+                "energy_level": wellness_entry.energy_level,
+                "stress_level": wellness_entry.stress_level,
+                "notes": wellness_entry.notes,
+                "timestamp": wellness_entry.timestamp.isoformat()
+            }
             self.db.commit()
-            self.db.refresh(wellness_entry)
             
             # Return the saved data
             return {
                 "status": "success",
                 "message": "Wellness check-in recorded successfully",
-                "data": {
-                    "id": wellness_entry.id,
-                    "user_id": wellness_entry.user_id,
-                    "mood": wellness_entry.mood,
-                    "energy_level": wellness_entry.energy_level,
-                    "stress_level": wellness_entry.stress_level,
-                    "notes": wellness_entry.notes,
-                    "timestamp": wellness_entry.timestamp.isoformat()
-                }
+                "data": saved_entry
             }
-        except Exception as e:
+        except SQLAlchemyError as e:
             # Rollback in case of error
-            if self.db:
-                self.db.rollback()
-            return {
-                "status": "error",
-                "message": f"Failed to save wellness check-in: {str(e)}"
-            }
+            self.db.rollback()
+            raise WellnessError(f"Failed to save wellness check-in: {str(e)}") from e
+    
+    def process_wellness_checkins_bulk(self, checkins, user_id="default_user"):
+        """
+        Save several wellness check-ins (e.g. an offline sync) in one transaction.
+        
+        Args:
+            checkins (list): Dicts with mood, energy_level, stress_level and optional
+                notes and timestamp (ISO 8601, defaults to now)
+            user_id (str, optional): The ID of the user
             
-    def analyze_with_groq(self, checkin_data):
+        Returns:
+            dict: The number of check-ins saved
+            
+        Raises:
+            WellnessError: If a timestamp is invalid or the insert fails.
+        """
+        now = datetime.utcnow()
+        rows = []
+        for checkin in checkins:
+            try:
+                timestamp = self._parse_checkin_timestamp(checkin.get('timestamp')) or now
+            except (ValueError, OverflowError) as e:
+                raise WellnessError(f"Invalid check-in timestamp: {checkin.get('timestamp')}", status_code=400) from e
+            rows.append({
+                "user_id": user_id,
+                "mood": checkin['mood'],
+                "energy_level": checkin['energy_level'],
+                "stress_level": checkin['stress_level'],
+                "notes": checkin.get('notes', ''),
+                "timestamp": timestamp
+            })
+        
+        try:
+            # One executemany INSERT and one commit for the whole batch
+            self.db.execute(insert(WellnessProgress), rows)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise WellnessError(f"Failed to save wellness check-ins: {str(e)}") from e
+        
+        return {
+            "status": "success",
+            "message": f"Recorded {len(rows)} wellness check-ins",
+            "saved_entries": len(rows)
+        }
+    
+    @staticmethod
+    def _parse_checkin_timestamp(value):
+        """Parse an ISO 8601 timestamp into naive UTC, as stored in the database"""
+        if value is None or value == '':
+            return None
+        if not isinstance(value, str):
+            raise ValueError(f"expected an ISO 8601 string, got {type(value).__name__}")
+        timestamp = isoparse(value)
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        return timestamp
+            
+    def analyze_with_groq(self, checkin_data, user_id=None):
         """
         Analyze the checkin data using Groq to provide guidance, recommendations, and themes.
+        When user_id is given, an analysis of the identical check-in history for
+        that user is served from the analysis cache.
 
         Args:
             checkin_data (list): The checkin data for a user.
+            user_id (str, optional): Owner of the data, used to scope cached analyses.
 
         Returns:
             dict: The analysis results from Groq including guidance, recommendations, and themes.
+            
+        Raises:
+            WellnessError: If Groq is unavailable or returns an unusable reply.
         """
+        from groq import GroqError
+        from tenacity import RetryError
+        
         try:
-            # Format the checkin data for the prompt
-            checkin_summary = json.dumps(checkin_data, indent=2)
-            
-            # System prompt to enforce JSON response
-            system_prompt = """IMPORTANT: You MUST respond ONLY with a valid JSON object using this exact structure:
-            {{
-                "guidance": "Detailed personalized guidance based on Islamic principles",
-                "recommendations": ["Recommendation 1", "Recommendation 2", "Recommendation 3"],
-                "themes": ["Theme 1", "Theme 2", "Theme 3"]
-            }}
-
-            Do not include any explanations, markdown formatting, or text outside of the JSON structure."""
-            
-            # User prompt with specific instructions
-            prompt = f"""
-            Analyze the following wellness check-in data and provide:
-            1. Personalized guidance based on Islamic principles
-            2. Specific recommendations for improving wellness
-            3. Key themes or patterns identified in the data
-
-            Check-in Data:
-            {checkin_summary}
-            """
+            # Compact JSON without row ids: neither whitespace nor ids help the model, both cost tokens
+            checkin_rows = [{key: value for key, value in row.items() if key != "id"} for row in checkin_data]
+            if ORJSON_AVAILABLE:
+                checkin_bytes = orjson.dumps(checkin_rows)
+                checkin_summary = checkin_bytes.decode()
+            else:
+                checkin_summary = json.dumps(checkin_rows, separators=(",", ":"), ensure_ascii=False)
+                checkin_bytes = checkin_summary.encode()
+            
+            cache_key = None
+            if user_id is not None:
+                cache_key = (user_id, hashlib.blake2b(checkin_bytes, digest_size=16).digest())
+                cached = _analysis_cache.get(cache_key)
+                if cached is not None:
+                    return dict(cached)
+            
+            # Instructions live in a fixed system message; the user message is only the data
+            prompt = f"Check-ins:\n{checkin_summary}"
+            
+            from app.core.groq_client import groq_client
             
             response = groq_client.generate_response(
-                system_prompt=system_prompt,
+                system_prompt=ANALYSIS_SYSTEM_PROMPT,
                 prompt=prompt,
                 max_tokens=1000,
-                temperature=0.3
+                temperature=0.3,
+                response_format={"type": "json_object"}
             )
             
-            content = response
+            analysis_results = orjson.loads(response) if ORJSON_AVAILABLE else json.loads(response)
             
-            try:
-                analysis_results = json.loads(content)
-            except json.JSONDecodeError:
-                json_match = re.search(r'({[\s\S]*})', content)
-                if json_match:
-                    json_str = json_match.group(1)
-                    try:
-                        analysis_results = json.loads(json_str)
-                    except json.JSONDecodeError:
-                        analysis_results = {
-                            "guidance": content,
-                            "recommendations": [],
-                            "themes": []
-                        }
-                else:
-                    # Fallback if no JSON pattern found
-                    analysis_results = {
-                        "guidance": content,
-                        "recommendations": [],
-                        "themes": []
-                    }
+            if cache_key is not None:
+                _analysis_cache.set(cache_key, dict(analysis_results))
                 
             return analysis_results
-        except Exception as e:
-            return {
-                "status": "error",
-                "message": f"An error occurred during Groq analysis: {str(e)}",
-                "guidance": "We couldn't analyze your data at this time. Please try again later.",
-                "recommendations": [],
-                "themes": []
-            }
+        except (GroqError, RetryError, ValueError) as e:
+            # ValueError covers a missing GROQ_API_KEY and undecodable replies
+            raise WellnessError(
+                f"An error occurred during Groq analysis: {str(e)}",
+                status_code=GROQ_FAILURE_STATUS,
+                guidance="We couldn't analyze your data at this time. Please try again later.",
+                recommendations=[],
+                themes=[]
+            ) from e
 
     def clear_wellness_data(self, user_id: str) -> Dict:
         """Clear all wellness data for a user."""
         try:
-            # Get count before deletion for reporting
-            count = self.db.query(WellnessProgress).filter_by(user_id=user_id).count()
-            
-            # Delete all wellness progress entries for the user
-            self.db.query(WellnessProgress).filter_by(user_id=user_id).delete()
+            # Bulk delete all wellness progress entries for the user; the returned
+            # rowcount is reported, so no separate COUNT query is needed
+            count = self.db.query(WellnessProgress).filter_by(user_id=user_id).delete(synchronize_session=False)
             self.db.commit()
             
             return {
@@ -217,21 +327,15 @@ class WellnessService:
                 "message": f"Cleared {count} wellness entries for user {user_id}",
                 "deleted_entries": count
             }
-        except Exception as e:
+        except SQLAlchemyError as e:
             self.db.rollback()
-            return {
-                "success": False,
-                "message": f"Failed to clear wellness data: {str(e)}"
-            }
+            raise WellnessError(f"Failed to clear wellness data: {str(e)}", success=False) from e
 
     def clear_all_wellness_data(self) -> Dict:
         """Clear all wellness data for all users (admin function)."""
         try:
-            # Get count before deletion for reporting
-            count = self.db.query(WellnessProgress).count()
-            
-            # Delete all wellness progress entries
-            self.db.query(WellnessProgress).delete()
+            # Bulk delete all wellness progress entries, reporting the rowcount
+            count = self.db.query(WellnessProgress).delete(synchronize_session=False)
             self.db.commit()
             
             return {
@@ -239,9 +343,10 @@ class WellnessService:
                 "message": f"Cleared all {count} wellness entries from the database",
                 "deleted_entries": count
             }
-        except Exception as e:
+        except SQLAlchemyError as e:
             self.db.rollback()
-            return {
-                "success": False,
-                "message": f"Failed to clear all wellness data: {str(e)}"
-            }
+            raise WellnessError(f"Failed to clear all wellness data: {str(e)}", success=False) from e
+
+
+# Shared instance; routes bind the request's session with bind_db_session
+wellness_service = WellnessService()
@@ -0,0 +1,146 @@
+"""
+Small in-process caches shared by the services.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+import numpy as np
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with a fixed number of entries."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for key (marking it recently used), or default."""
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry when full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def items(self) -> list:
+        """Snapshot of (key, value) pairs, least recently used first."""
+        with self._lock:
+            return list(self._data.items())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SemanticCache:
+    """
+    Cache keyed by embeddings: a lookup hits when a stored embedding has cosine
+    similarity >= threshold with the query embedding, so near-identical queries
+    ("anxiety", "feeling anxious") share one result.
+
+    Entries can be scoped with a hashable namespace (e.g. max_results); a lookup
+    only matches entries stored under the same namespace. Least recently used
+    entries are evicted first.
+
+    Embeddings are normalized once on insert and kept as rows of one float32
+    matrix (grown by doubling up to maxsize), so a lookup is a single matrix-vector
+    product over the cache.
+    """
+
+    def __init__(self, maxsize: int = 512, threshold: float = 0.98):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self._vectors = None  # (capacity, dim) unit embeddings, allocated on first set
+        self._size = 0  # rows ever handed out; freed rows are reused before growing
+        self._free_rows = []
+        self._rows = OrderedDict()  # row -> (namespace, value), least recently used first
+        self._namespace_rows = {}  # namespace -> set of rows
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def get(self, embedding, namespace: Hashable = None, default: Optional[Any] = None) -> Any:
+        """Return the value of the most similar entry above the threshold, or default."""
+        query = self._normalize(embedding)
+        with self._lock:
+            rows = self._namespace_rows.get(namespace)
+            if not rows:
+                return default
+
+            candidates = np.fromiter(rows, dtype=np.intp, count=len(rows))
+            similarities = (self._vectors[:self._size] @ query)[candidates]
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return default
+
+            row = int(candidates[best])
+            self._rows.move_to_end(row)
+            return self._rows[row][1]
+
+    def set(self, embedding, value: Any, namespace: Hashable = None) -> None:
+        """Store value under embedding, evicting the least recently used entry when full."""
+        vector = self._normalize(embedding)
+        with self._lock:
+            if len(self._rows) >= self.maxsize:
+                self._evict(next(iter(self._rows)))
+
+            if self._free_rows:
+                row = self._free_rows.pop()
+            else:
+                row = self._size
+                self._reserve(row + 1, vector.shape[0])
+                self._size += 1
+
+            self._vectors[row] = vector
+            self._rows[row] = (namespace, value)
+            self._namespace_rows.setdefault(namespace, set()).add(row)
+
+    def _reserve(self, rows: int, dim: int) -> None:
+        """Ensure the matrix has room for rows entries, doubling its capacity as needed."""
+        if self._vectors is None:
+            self._vectors = np.empty((min(16, self.maxsize), dim), dtype=np.float32)
+        if rows <= len(self._vectors):
+            return
+
+        capacity = min(2 * len(self._vectors), self.maxsize)
+        vectors = np.empty((capacity, dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        self._vectors = vectors
+
+    def _evict(self, row: int) -> None:
+        namespace, _ = self._rows.pop(row)
+        rows = self._namespace_rows[namespace]
+        rows.discard(row)
+        if not rows:
+            del self._namespace_rows[namespace]
+        self._free_rows.append(row)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors = None
+            self._size = 0
+            self._free_rows.clear()
+            self._rows.clear()
+            self._namespace_rows.clear()
+
+    def __len__(self) -> int:
+        return len(self._rows)
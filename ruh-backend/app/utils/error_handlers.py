@@ -1,4 +1,5 @@
 from flask import jsonify
+from app.services.wellness_service import WellnessError
 
 def register_error_handlers(app):
     """
@@ -14,4 +15,8 @@ def register_error_handlers(app):
     
     @app.errorhandler(500)
     def internal_error(error):
-        return jsonify({"error": "Internal server error"}), 500
\ No newline at end of file
+        return jsonify({"error": "Internal server error"}), 500
+    
+    @app.errorhandler(WellnessError)
+    def wellness_error(error):
+        return jsonify(error.to_dict()), error.status_code
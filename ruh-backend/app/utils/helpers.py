@@ -1,6 +1,9 @@
 from flask import request
 import re
 
+# Characters stripped from user input
+UNSAFE_CHARS_PATTERN = re.compile(r'[<>{}]')
+
 def validate_chat_request(req):
     """
     Validate chat request parameters
@@ -30,7 +33,7 @@ def sanitize_input(text):
         return text
     
     # Remove potentially harmful characters
-    text = re.sub(r'[<>{}]', '', text)
+    text = UNSAFE_CHARS_PATTERN.sub('', text)
     # Trim whitespace
     text = text.strip()
     # Limit length
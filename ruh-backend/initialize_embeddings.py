@@ -8,7 +8,7 @@ Usage:
     
 Options:
     --force: Force regeneration of embeddings even if they already exist
-    --model: Specify the embedding model to use (default: paraphrase-multilingual-MiniLM-L12-v2)
+    --model: Specify the embedding model to use (default: EMBEDDING_MODEL, paraphrase-multilingual-MiniLM-L12-v2)
 """
 
 import sys
@@ -19,8 +19,8 @@ from pathlib import Path
 # Add the app directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
 
-from services.verse_service import VerseService
-from services.embedding_service import EmbeddingService
+from services.verse_service import get_verse_service
+from services.embedding_service import EmbeddingService, EMBEDDING_MODEL
 from services.vector_store import VectorStoreManager
 
 
@@ -29,7 +29,7 @@ def main():
     parser.add_argument('--force', action='store_true', 
                        help='Force regeneration of embeddings even if they already exist')
     parser.add_argument('--model', type=str, 
-                       default='paraphrase-multilingual-MiniLM-L12-v2',
+                       default=EMBEDDING_MODEL,
                        help='Embedding model to use')
     parser.add_argument('--batch-size', type=int, default=100,
                        help='Batch size for processing verses')
@@ -44,7 +44,7 @@ def main():
     try:
         # Initialize services
         print("📚 Loading verse data...")
-        verse_service = VerseService()
+        verse_service = get_verse_service()
         
         # Check if we have verses
         all_verses = verse_service.get_all_verses()
@@ -156,12 +156,11 @@ def check_dependencies():
     try:
         import sentence_transformers
         import numpy
-        import sklearn
         return True
     except ImportError as e:
         print(f"❌ Missing dependency: {e}")
         print("Please install required packages:")
-        print("   pip install sentence-transformers numpy scikit-learn")
+        print("   pip install sentence-transformers numpy")
         return False
 
 
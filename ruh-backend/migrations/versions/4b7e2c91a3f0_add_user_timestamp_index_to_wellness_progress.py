@@ -0,0 +1,38 @@
+"""Add (user_id, timestamp DESC) index to wellness_progress
+
+Revision ID: 4b7e2c91a3f0
+Revises: d96da03c0d9a
+Create Date: 2026-10-16 10:12:41.508317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2c91a3f0'
+down_revision: Union[str, None] = 'd96da03c0d9a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_wellness_user_ts',
+            'wellness_progress',
+            ['user_id', sa.text('timestamp DESC')],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_wellness_user_ts',
+            table_name='wellness_progress',
+            postgresql_concurrently=True,
+        )
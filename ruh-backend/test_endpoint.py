@@ -11,7 +11,7 @@ import os
 # Add the app directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
 
-from services.verse_service import VerseService
+from services.verse_service import get_verse_service
 
 def test_chapter_performance():
     """Test the performance of the optimized chapter details endpoint."""
@@ -23,7 +23,7 @@ def test_chapter_performance():
     print("\n1. Testing chapter loading WITHOUT translations:")
     start_time = time.time()
     
-    verse_service = VerseService()
+    verse_service = get_verse_service()
     chapter = verse_service.get_chapter_with_verses(
         surah_number=1, 
         include_summary=False, 
@@ -91,8 +91,8 @@ def test_chapter_performance():
     print("\n4. Testing service initialization performance:")
     start_time = time.time()
     
-    # Create a new instance (should use singleton)
-    new_service = VerseService()
+    # Fetch the service again (should return the shared instance)
+    new_service = get_verse_service()
     
     end_time = time.time()
     duration = end_time - start_time
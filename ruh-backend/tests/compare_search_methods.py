@@ -3,11 +3,11 @@
 Comparison script to demonstrate the improvement of semantic search over keyword matching.
 """
 
-from app.services.verse_service import VerseService
+from app.services.verse_service import get_verse_service
 
 def compare_search_methods():
     """Compare keyword vs semantic search for various queries."""
-    verse_service = VerseService()
+    verse_service = get_verse_service()
     
     test_queries = [
         "guidance and wisdom",
@@ -0,0 +1,152 @@
+"""
+Tests for the shared in-process caches (LRUCache and SemanticCache).
+"""
+
+import numpy as np
+
+from app.utils.cache import LRUCache, SemanticCache
+
+
+def unit(*components):
+    return np.array(components, dtype=np.float32)
+
+
+# LRUCache
+
+def test_lru_get_missing_returns_default():
+    lru = LRUCache(maxsize=2)
+    assert lru.get("missing") is None
+    assert lru.get("missing", "fallback") == "fallback"
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUCache(maxsize=2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    # Reading "a" makes "b" the least recently used entry
+    assert lru.get("a") == 1
+    lru.set("c", 3)
+
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+    assert lru.get("c") == 3
+    assert len(lru) == 2
+
+
+def test_lru_overwrite_refreshes_entry():
+    lru = LRUCache(maxsize=2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.set("a", 10)
+    lru.set("c", 3)
+
+    assert lru.get("a") == 10
+    assert lru.get("b") is None
+
+
+def test_lru_items_least_recently_used_first():
+    lru = LRUCache(maxsize=3)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+
+    assert lru.items() == [("b", 2), ("a", 1)]
+
+
+def test_lru_clear():
+    lru = LRUCache(maxsize=2)
+    lru.set("a", 1)
+    lru.clear()
+    assert len(lru) == 0
+    assert lru.get("a") is None
+
+
+# SemanticCache
+
+def test_semantic_hit_above_threshold():
+    semantic = SemanticCache(maxsize=4, threshold=0.98)
+    semantic.set(unit(1, 0, 0), "anxiety")
+
+    # Scaling does not change cosine similarity
+    assert semantic.get(unit(2, 0, 0)) == "anxiety"
+    assert semantic.get(unit(1, 0.05, 0)) == "anxiety"
+
+
+def test_semantic_miss_below_threshold():
+    semantic = SemanticCache(maxsize=4, threshold=0.98)
+    semantic.set(unit(1, 0, 0), "anxiety")
+
+    assert semantic.get(unit(1, 1, 0)) is None
+    assert semantic.get(unit(0, 1, 0), default="none") == "none"
+
+
+def test_semantic_returns_most_similar_entry():
+    semantic = SemanticCache(maxsize=4, threshold=0.5)
+    semantic.set(unit(1, 0, 0), "x")
+    semantic.set(unit(0.8, 0.6, 0), "xy")
+
+    assert semantic.get(unit(0.75, 0.66, 0)) == "xy"
+    assert semantic.get(unit(1, 0.1, 0)) == "x"
+
+
+def test_semantic_namespaces_are_isolated():
+    semantic = SemanticCache(maxsize=4, threshold=0.98)
+    semantic.set(unit(1, 0, 0), "three results", namespace=3)
+    semantic.set(unit(1, 0, 0), "five results", namespace=5)
+
+    assert semantic.get(unit(1, 0, 0), namespace=3) == "three results"
+    assert semantic.get(unit(1, 0, 0), namespace=5) == "five results"
+    assert semantic.get(unit(1, 0, 0)) is None
+    assert semantic.get(unit(1, 0, 0), namespace=7) is None
+
+
+def test_semantic_evicts_least_recently_used():
+    semantic = SemanticCache(maxsize=2, threshold=0.98)
+    semantic.set(unit(1, 0, 0), "a")
+    semantic.set(unit(0, 1, 0), "b")
+    # Reading "a" makes "b" the least recently used entry
+    assert semantic.get(unit(1, 0, 0)) == "a"
+    semantic.set(unit(0, 0, 1), "c")
+
+    assert len(semantic) == 2
+    assert semantic.get(unit(0, 1, 0)) is None
+    assert semantic.get(unit(1, 0, 0)) == "a"
+    assert semantic.get(unit(0, 0, 1)) == "c"
+
+
+def test_semantic_reuses_evicted_rows():
+    semantic = SemanticCache(maxsize=2, threshold=0.98)
+    semantic.set(unit(1, 0, 0), "a")
+    semantic.set(unit(0, 1, 0), "b")
+    for value, vector in (("c", unit(0, 0, 1)), ("d", unit(1, 1, 0)), ("e", unit(0, 1, 1))):
+        semantic.set(vector, value)
+
+    # Evicted rows are handed out again instead of growing the matrix
+    assert semantic._size == 2
+    assert len(semantic._vectors) == 2
+    assert semantic.get(unit(1, 1, 0)) == "d"
+    assert semantic.get(unit(0, 1, 1)) == "e"
+    # The stale vectors of evicted entries no longer match
+    assert semantic.get(unit(1, 0, 0)) is None
+    assert semantic.get(unit(0, 0, 1)) is None
+
+
+def test_semantic_grows_matrix_and_keeps_entries():
+    semantic = SemanticCache(maxsize=64, threshold=0.999)
+    vectors = np.eye(40, dtype=np.float32)
+    for i, vector in enumerate(vectors):
+        semantic.set(vector, i)
+
+    assert len(semantic) == 40
+    assert all(semantic.get(vector) == i for i, vector in enumerate(vectors))
+
+
+def test_semantic_clear():
+    semantic = SemanticCache(maxsize=4, threshold=0.98)
+    semantic.set(unit(1, 0, 0), "a")
+    semantic.clear()
+
+    assert len(semantic) == 0
+    assert semantic.get(unit(1, 0, 0)) is None
+    semantic.set(unit(0, 1, 0), "b")
+    assert semantic.get(unit(0, 1, 0)) == "b"
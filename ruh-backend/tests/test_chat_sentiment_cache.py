@@ -0,0 +1,73 @@
+"""
+Tests for the chat sentiment cache: only the same message text may reuse an analysis.
+"""
+
+from app.services.chat_service import ChatService, SENTIMENT_CACHE_SIZE
+from app.utils.cache import LRUCache
+
+
+class FakeGroqClient:
+    """Returns a distinct analysis per call and counts the calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_structured_response(self, prompt):
+        self.calls += 1
+        return {"sentiment": f"reply-{self.calls}", "themes": ["test"], "intent": "general_chat"}
+
+
+class FakePrompts:
+    def get_sentiment_prompt(self, user_message):
+        return user_message
+
+
+def make_chat_service():
+    # Skip __init__, which loads the verse service and database-backed services
+    service = ChatService.__new__(ChatService)
+    service.groq_client = FakeGroqClient()
+    service.prompts = FakePrompts()
+    service._sentiment_cache = LRUCache(maxsize=SENTIMENT_CACHE_SIZE)
+    return service
+
+
+def test_same_message_reuses_analysis():
+    service = make_chat_service()
+    first = service._analyze_sentiment("I feel so sad today")
+    second = service._analyze_sentiment("  i feel SO sad   today ")
+
+    assert second == first
+    assert service.groq_client.calls == 1
+
+
+def test_negated_message_misses_cache():
+    service = make_chat_service()
+    sad = service._analyze_sentiment("I'm so sad")
+    not_sad = service._analyze_sentiment("I'm not sad anymore")
+
+    assert not_sad != sad
+    assert service.groq_client.calls == 2
+
+
+def test_use_cache_false_always_calls_groq():
+    service = make_chat_service()
+    service._analyze_sentiment("I feel so sad today", use_cache=False)
+    service._analyze_sentiment("I feel so sad today", use_cache=False)
+
+    assert service.groq_client.calls == 2
+
+
+def test_small_talk_skips_groq():
+    service = make_chat_service()
+    analysis = service._analyze_sentiment("Salam, thanks!")
+
+    assert analysis == service._default_sentiment()
+    assert service.groq_client.calls == 0
+
+
+def test_message_without_words_still_calls_groq():
+    service = make_chat_service()
+    for message in ("😭😭", "..."):
+        service._analyze_sentiment(message)
+
+    assert service.groq_client.calls == 2
@@ -9,13 +9,13 @@ import os
 # Add the app directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
 
-from services.verse_service import VerseService
+from services.verse_service import get_verse_service
 
 def test_queries():
     """Test various queries to compare semantic vs keyword search"""
     
     # Initialize verse service
-    verse_service = VerseService()
+    verse_service = get_verse_service()
     
     test_queries = [
         "guidance and wisdom",
@@ -82,7 +82,7 @@ def test_queries():
 def test_specific_verse_retrieval():
     """Test retrieving specific verses to ensure the system works"""
     
-    verse_service = VerseService()
+    verse_service = get_verse_service()
     
     print("\n🔍 Testing Specific Verse Retrieval:")
     print("-" * 40)
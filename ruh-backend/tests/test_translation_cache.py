@@ -0,0 +1,70 @@
+"""
+Tests for the persisted translation cache file.
+"""
+
+import json
+
+from app.services import translation_service
+from app.services.translation_service import TranslationService
+
+
+class FakeGroqClient:
+    def generate_response(self, prompt, **kwargs):
+        return f"translation of {prompt.rsplit(': ', 1)[-1]}"
+
+
+def make_service(cache_path):
+    service = TranslationService(cache_path=str(cache_path))
+    service.groq_client = FakeGroqClient()
+    return service
+
+
+def read_records(cache_path):
+    with open(cache_path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_translations_survive_restart(tmp_path):
+    cache_path = tmp_path / "translations.jsonl"
+    make_service(cache_path).translate_arabic_to_english("نص")
+
+    restarted = make_service(cache_path)
+    restarted.groq_client = None  # a cache miss would fail
+    assert restarted.translate_arabic_to_english("نص")["translation"] == "translation of نص"
+
+
+def test_truncated_last_line_is_dropped_and_repaired(tmp_path):
+    cache_path = tmp_path / "translations.jsonl"
+    good = json.dumps({"arabic_text": "أ", "translation": "a"}, ensure_ascii=False)
+    cache_path.write_text(good + '\n{"arabic_text": "ب", "transl', encoding='utf-8')
+
+    service = make_service(cache_path)
+    assert service.translate_arabic_to_english("أ")["translation"] == "a"
+
+    # The next append starts on its own line instead of being glued to the fragment
+    service.translate_arabic_to_english("ت")
+    assert [r["arabic_text"] for r in read_records(cache_path)] == ["أ", "ت"]
+
+
+def test_duplicates_are_compacted_on_load(tmp_path):
+    cache_path = tmp_path / "translations.jsonl"
+    lines = [json.dumps({"arabic_text": "أ", "translation": t}, ensure_ascii=False) for t in ("old", "new")]
+    cache_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    service = make_service(cache_path)
+    assert service.translate_arabic_to_english("أ")["translation"] == "new"
+    assert read_records(cache_path) == [{"arabic_text": "أ", "translation": "new"}]
+
+
+def test_file_is_capped(tmp_path, monkeypatch):
+    monkeypatch.setattr(translation_service, "TRANSLATION_CACHE_MAX_LINES", 4)
+    cache_path = tmp_path / "translations.jsonl"
+    service = make_service(cache_path)
+    service._translations.maxsize = 3
+
+    for i in range(10):
+        service.translate_arabic_to_english(f"نص {i}")
+
+    records = read_records(cache_path)
+    assert len(records) <= 4
+    assert records[-1]["arabic_text"] == "نص 9"
@@ -0,0 +1,41 @@
+"""
+Tests for wellness route error handling.
+"""
+
+from unittest import mock
+
+import pytest
+from flask import Flask
+
+import app.routes.wellness as wellness_routes
+from app.utils.error_handlers import register_error_handlers
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(wellness_routes.wellness_bp, url_prefix='/api')
+    register_error_handlers(app)
+    # No database is needed for the validation paths under test
+    with mock.patch.object(wellness_routes, 'SessionLocal'):
+        yield app.test_client()
+
+
+@pytest.mark.parametrize("url", ['/api/wellness/checkin', '/api/wellness/checkin/bulk'])
+def test_malformed_json_returns_400(client, url):
+    response = client.post(url, data='{not json', content_type='application/json')
+    assert response.status_code == 400
+
+
+def test_bulk_rejects_non_object_body(client):
+    response = client.post('/api/wellness/checkin/bulk', json=[1, 2])
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Request body must be a JSON object"}
+
+
+def test_unexpected_error_returns_500(client):
+    with mock.patch.object(wellness_routes.wellness_service, 'clear_wellness_data',
+                           side_effect=RuntimeError("boom")):
+        response = client.delete('/api/wellness/clear?user_id=u')
+    assert response.status_code == 500
+    assert response.get_json() == {"error": "boom"}
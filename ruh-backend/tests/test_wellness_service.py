@@ -0,0 +1,39 @@
+"""
+Tests for bulk wellness check-in validation.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.services.wellness_service import WellnessService, WellnessError
+
+
+def make_checkin(**fields):
+    return {"mood": "calm", "energy_level": 3, "stress_level": 2, **fields}
+
+
+@pytest.mark.parametrize("timestamp", ["not a date", "2024-13-45T99:00:00"])
+def test_bulk_rejects_bad_date_string(timestamp):
+    with pytest.raises(WellnessError) as excinfo:
+        WellnessService().process_wellness_checkins_bulk([make_checkin(timestamp=timestamp)])
+
+    assert excinfo.value.status_code == 400
+
+
+@pytest.mark.parametrize("timestamp", [1700000000, {"date": "2024-01-01"}, ["2024-01-01"]])
+def test_bulk_rejects_non_string_timestamp(timestamp):
+    with pytest.raises(WellnessError) as excinfo:
+        WellnessService().process_wellness_checkins_bulk([make_checkin(timestamp=timestamp)])
+
+    assert excinfo.value.status_code == 400
+
+
+def test_parse_timestamp_converts_to_naive_utc():
+    parsed = WellnessService._parse_checkin_timestamp("2024-01-01T12:00:00+02:00")
+    assert parsed == datetime(2024, 1, 1, 10, 0)
+
+
+@pytest.mark.parametrize("timestamp", [None, ""])
+def test_parse_timestamp_missing_returns_none(timestamp):
+    assert WellnessService._parse_checkin_timestamp(timestamp) is None
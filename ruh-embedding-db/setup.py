@@ -8,6 +8,7 @@ If embeddings already exist, it will skip generation and directly inject data in
 
 import os
 import json
+import hashlib
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from typing import List, Dict, Any, Tuple, Optional
@@ -16,6 +17,13 @@ import time
 from collections import defaultdict
 import sys
 
+# Prefer orjson for parsing the (large) source JSON files when it is installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Import Qdrant client for vector database operations
 try:
     from qdrant_client import QdrantClient
@@ -39,18 +47,28 @@ OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "embedding
 # Ensure output directory exists
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# Model configuration
-MODEL_NAME = "paraphrase-multilingual-mpnet-base-v2"  # Fast and efficient model for semantic search
+# Model configuration. Must match the backend's query model (EMBEDDING_MODEL in
+# ruh-backend/app/services/embedding_service.py) so stored and query vectors share one space
+MODEL_NAME = os.environ.get("EMBEDDING_MODEL", "paraphrase-multilingual-MiniLM-L12-v2")
 
 # Qdrant configuration
 QDRANT_HOST = os.environ.get("QDRANT_HOST", "localhost")
 QDRANT_PORT = int(os.environ.get("QDRANT_PORT", 6333))
 COLLECTION_NAME = "quran_embeddings"
 
+# Shared stand-in for surahs without analysis data (never mutated)
+_EMPTY_ANALYSES = {"summary": "", "summary_themes": [], "summary_sentiment": "", "chunks": []}
+# Vector quantization for the collection: "scalar" (int8) or "binary" (1 bit per dimension)
+QDRANT_QUANTIZATION = os.environ.get("QDRANT_QUANTIZATION", "scalar").lower()
+
 
 def load_json_file(file_path: str) -> Any:
     """Load JSON data from file."""
     try:
+        if ORJSON_AVAILABLE:
+            # orjson parses bytes directly; its JSONDecodeError subclasses json's
+            with open(file_path, 'rb') as f:
+                return orjson.loads(f.read())
         with open(file_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     except FileNotFoundError:
@@ -80,10 +98,64 @@ def check_embeddings_exist() -> bool:
             logger.info(f"Missing required file: {file_path}")
             return False
     
+    # Reuse only embeddings built from the current source data with the current model
+    metadata = load_json_file(os.path.join(OUTPUT_DIR, "metadata.json")) or {}
+    if metadata.get("model") != MODEL_NAME:
+        logger.info(f"Embeddings were generated with {metadata.get('model')}, expected {MODEL_NAME}")
+        return False
+    if metadata.get("source_hash") != compute_source_hash():
+        logger.info("Source data changed since embeddings were generated")
+        return False
+    
     logger.info("All embedding files already exist")
     return True
 
 
+def compute_source_hash(model_name: str = MODEL_NAME) -> str:
+    """
+    Fingerprint the inputs that determine the embeddings.
+    
+    Returns:
+        str: SHA-256 hex digest over the source JSON files and the model name
+    """
+    digest = hashlib.sha256(model_name.encode("utf-8"))
+    for file_name in ("quran_verses.json", "surah_analysis.json"):
+        file_path = os.path.join(DATA_DIR, file_name)
+        if os.path.exists(file_path):
+            digest.update(file_name.encode("utf-8"))
+            with open(file_path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def get_quantization_config():
+    """
+    Build the Qdrant quantization config selected by QDRANT_QUANTIZATION.
+    
+    Both modes keep the compressed vectors in RAM for scoring while the original
+    float32 vectors stay on the collection for rescoring.
+    
+    Returns:
+        models.BinaryQuantization or models.ScalarQuantization
+    """
+    if QDRANT_QUANTIZATION == "binary":
+        # 1 bit per dimension (32x smaller), scored with XOR + popcount
+        logger.info("Using binary quantization")
+        return models.BinaryQuantization(
+            binary=models.BinaryQuantizationConfig(always_ram=True)
+        )
+    
+    # int8 scalar quantization: 4x smaller vectors
+    logger.info("Using int8 scalar quantization")
+    return models.ScalarQuantization(
+        scalar=models.ScalarQuantizationConfig(
+            type=models.ScalarType.INT8,
+            quantile=0.99,
+            always_ram=True
+        )
+    )
+
+
 def inject_data_into_qdrant(payload_list: List[Dict], vector_list: List[List[float]]) -> bool:
     """
     Inject data into Qdrant vector database.
@@ -112,6 +184,17 @@ def inject_data_into_qdrant(payload_list: List[Dict], vector_list: List[List[flo
             logger.error("No vectors to inject")
             return False
         
+        # Upserts into a collection of another dimension are rejected, so drop it and rebuild below
+        if COLLECTION_NAME in collection_names:
+            existing_size = client.get_collection(COLLECTION_NAME).config.params.vectors.size
+            if existing_size != vector_size:
+                logger.warning(
+                    f"Collection {COLLECTION_NAME} has vector size {existing_size}, "
+                    f"embeddings have {vector_size}; recreating it"
+                )
+                client.delete_collection(collection_name=COLLECTION_NAME)
+                collection_names.remove(COLLECTION_NAME)
+        
         # Create collection if it doesn't exist
         if COLLECTION_NAME not in collection_names:
             logger.info(f"Creating collection: {COLLECTION_NAME}")
@@ -120,11 +203,26 @@ def inject_data_into_qdrant(payload_list: List[Dict], vector_list: List[List[flo
                 vectors_config=models.VectorParams(
                     size=vector_size,
                     distance=models.Distance.COSINE
-                )
+                ),
+                # Denser HNSW graph than the defaults (m=16, ef_construct=100) for better
+                # recall; build cost is paid once at setup time
+                hnsw_config=models.HnswConfigDiff(
+                    m=32,
+                    ef_construct=200
+                ),
+                quantization_config=get_quantization_config()
             )
         else:
             logger.info(f"Collection {COLLECTION_NAME} already exists")
         
+        # Index surah_number so per-surah filtered scrolls (chapter pages) use the
+        # payload index instead of scanning every point; a no-op if it already exists
+        client.create_payload_index(
+            collection_name=COLLECTION_NAME,
+            field_name="surah_number",
+            field_schema=models.PayloadSchemaType.INTEGER
+        )
+        
         # Prepare points for upsert
         points = []
         for i, (payload, vector) in enumerate(zip(payload_list, vector_list)):
@@ -224,6 +322,12 @@ def flatten_merged_data(merged_data: Dict[int, Dict]) -> List[Dict]:
         surah_name = surah_data.get("name", "")
         revelation_place = surah_data.get("revelation_place", "")
         
+        # Surah-level analysis fields are the same for every verse; resolve them once
+        analyses = surah_data.get("analyses") or _EMPTY_ANALYSES
+        chunks = analyses.get("chunks", [])
+        summary = analyses.get("summary", "")
+        themes = ", ".join(analyses.get("summary_themes", []))
+        
         # Process verses
         for verse in surah_data.get("verses", []):
             verse_number = verse.get("verse_number", "")
@@ -231,15 +335,13 @@ def flatten_merged_data(merged_data: Dict[int, Dict]) -> List[Dict]:
             
             # Find relevant analysis chunks for this verse
             relevant_analyses = []
-            for chunk in surah_data.get("analyses", {}).get("chunks", []):
+            for chunk in chunks:
                 verse_range = chunk.get("verse_range", "")
                 if verse_range and verse_number in verse_range:
                     relevant_analyses.append(chunk.get("analysis", ""))
             
             # Create rich text for embedding that combines all available information
             analysis_text = " ".join(relevant_analyses)
-            summary = surah_data.get("analyses", {}).get("summary", "")
-            themes = ", ".join(surah_data.get("analyses", {}).get("summary_themes", []))
             
             text_for_embedding = (
                 f"Surah {surah_name} ({surah_number}) verse {verse_number}, "
@@ -272,10 +374,8 @@ def flatten_merged_data(merged_data: Dict[int, Dict]) -> List[Dict]:
             flattened_items.append(flattened_item)
         
         # Add surah-level item with summary
-        summary = surah_data.get("analyses", {}).get("summary", "")
         if summary:
-            themes = ", ".join(surah_data.get("analyses", {}).get("summary_themes", []))
-            sentiment = surah_data.get("analyses", {}).get("summary_sentiment", "")
+            sentiment = analyses.get("summary_sentiment", "")
             
             text_for_embedding = (
                 f"Complete analysis of Surah {surah_name} ({surah_number}), "
@@ -362,14 +462,14 @@ def main():
     if check_embeddings_exist():
         logger.info("Embeddings already exist, skipping generation")
         
-        # Load existing Qdrant-compatible data
-        qdrant_data_file = os.path.join(OUTPUT_DIR, "qdrant_data.json")
-        qdrant_data = load_json_file(qdrant_data_file)
+        # Rebuild the Qdrant data from the binary embeddings and the flattened items
+        # rather than re-parsing every vector as a JSON float list from qdrant_data.json
+        flattened_items = load_json_file(os.path.join(OUTPUT_DIR, "flattened_items.json"))
+        embeddings = np.load(os.path.join(OUTPUT_DIR, "embeddings.npy"), mmap_mode='r')
         
-        if qdrant_data:
-            logger.info("Loaded existing Qdrant data, injecting into Qdrant")
-            payload_list = qdrant_data.get("payload", [])
-            vector_list = qdrant_data.get("vectors", [])
+        if flattened_items and len(flattened_items) == len(embeddings):
+            logger.info("Loaded existing embeddings, injecting into Qdrant")
+            payload_list, vector_list = create_qdrant_compatible_data(flattened_items, embeddings)
             
             # Inject data into Qdrant
             if inject_data_into_qdrant(payload_list, vector_list):
@@ -377,7 +477,7 @@ def main():
             else:
                 logger.error("Failed to inject data into Qdrant")
         else:
-            logger.error("Failed to load existing Qdrant data")
+            logger.error("Failed to load existing embeddings data")
         
         return
     
@@ -438,6 +538,7 @@ def main():
         "surah_items": sum(1 for item in flattened_items if item["type"] == "surah"),
         "embedding_dim": embeddings.shape[1] if len(embeddings) > 0 else 0,
         "model": MODEL_NAME,
+        "source_hash": compute_source_hash(),
         "created_at": time.strftime("%Y-%m-%d %H:%M:%S")
     }
     